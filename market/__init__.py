@@ -0,0 +1 @@
+"""Shared helpers for the market price watcher bots."""
@@ -0,0 +1,74 @@
+import math
+from collections import deque
+
+import numpy as np
+
+# Bucket width of the price histogram: 1% steps, so a percentile is never off by more than 1%.
+RESOLUTION = 0.01
+MAX_PRICE = 10 ** 10
+BUCKETS = int(math.log(MAX_PRICE) / math.log1p(RESOLUTION)) + 1
+
+
+def bucket(price):
+    """Histogram bucket of a price; bucket b covers [(1 + RESOLUTION) ** b, (1 + RESOLUTION) ** (b + 1))."""
+    if price < 1:
+        return 0
+    return min(int(math.log(price) / math.log1p(RESOLUTION)), BUCKETS - 1)
+
+
+class PriceWindow:
+    """The last size prices, as a ring plus a log-bucketed histogram.
+
+    Adding a price is O(1): one bucket up for the new price, one down for the
+    one it evicts. A percentile is one cumulative sum over the fixed number of
+    buckets, never a sort of the history.
+    """
+
+    def __init__(self, size=200):
+        self.prices = deque(maxlen=size)
+        self.counts = np.zeros(BUCKETS, np.int32)
+
+    def __len__(self):
+        return len(self.prices)
+
+    def add(self, price):
+        if len(self.prices) == self.prices.maxlen:
+            self.counts[bucket(self.prices[0])] -= 1
+        self.prices.append(price)
+        self.counts[bucket(price)] += 1
+
+    def percentile(self, q):
+        """Lower edge of the bucket holding the q-th percentile (0-100), or None if empty."""
+        if not self.prices:
+            return None
+        rank = max(1, math.ceil(len(self.prices) * q / 100.0))
+        # Never past the highest price seen, whatever q is.
+        b = min(int(np.searchsorted(np.cumsum(self.counts), rank)), int(np.flatnonzero(self.counts)[-1]))
+        return math.ceil((1 + RESOLUTION) ** b) if b else 0
+
+
+class AdaptiveThreshold:
+    """Buy threshold that follows the market: the percentile-th percentile of recent prices.
+
+    Until min_samples prices have been seen the configured (fallback)
+    threshold is used. ceiling, if set, is the most it will ever allow.
+    """
+
+    def __init__(self, fallback, percentile=10.0, window=200, min_samples=20, ceiling=None):
+        if not 0 < percentile < 100:
+            raise ValueError(f"percentile must be between 0 and 100, got {percentile}")
+        self.fallback = fallback
+        self.percentile = percentile
+        self.min_samples = min_samples
+        self.ceiling = ceiling
+        self.window = PriceWindow(window)
+
+    def threshold(self):
+        """Current threshold, from the prices observed before now."""
+        if len(self.window) < self.min_samples:
+            return self.fallback
+        value = self.window.percentile(self.percentile)
+        return value if self.ceiling is None else min(value, self.ceiling)
+
+    def observe(self, price):
+        self.window.add(price)
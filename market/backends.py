@@ -0,0 +1,68 @@
+import threading
+from abc import ABC, abstractmethod
+
+import numpy as np
+
+
+class Capture(ABC):
+    """Source of screen pixels."""
+
+    @abstractmethod
+    def grab(self, region):
+        """Return the region as a (height, width, 4) BGRA uint8 array."""
+
+    def grab_into(self, region, out):
+        """Capture the region into out, a preallocated (height, width, 4) array, and return the pixels.
+
+        Backends that cannot write into a caller's buffer return their own
+        array instead: copying into out would only add a copy, so callers
+        must use the return value, not out.
+        """
+        return self.grab(region)
+
+
+class Input(ABC):
+    """Sink for mouse clicks."""
+
+    @abstractmethod
+    def click(self, x, y):
+        """Click the left mouse button at (x, y)."""
+
+    @abstractmethod
+    def position(self):
+        """Return the current (x, y) of the mouse."""
+
+
+class MssCapture(Capture):
+    """Screen capture through mss, one mss handle per thread.
+
+    mss always allocates its own buffer, so grab_into hands back a view of
+    it rather than copying into the caller's.
+    """
+
+    def __init__(self):
+        from mss import mss
+        self._mss = mss
+        self._local = threading.local()
+
+    def grab(self, region):
+        sct = getattr(self._local, "sct", None)
+        if sct is None:
+            sct = self._local.sct = self._mss()
+        # A view of mss's own pixel buffer, not a copy.
+        return np.asarray(sct.grab(region))
+
+
+class PyAutoGuiInput(Input):
+    """Real mouse clicks through pyautogui."""
+
+    def __init__(self):
+        import pyautogui
+        self._pyautogui = pyautogui
+
+    def click(self, x, y):
+        self._pyautogui.click(x, y)
+
+    def position(self):
+        pos = self._pyautogui.position()
+        return pos.x, pos.y
@@ -0,0 +1,134 @@
+"""Recognition of a batch of price crops spread over worker processes.
+
+Template matching and the EasyOCR fallback are CPU-bound and hold the GIL
+for much of their time, so more recognizer threads do not mean more
+throughput. BatchRecognizer splits a batch between worker processes
+instead. The crops travel through one shared-memory block: the parent
+copies the grayscale pixels in and each task carries only (offset, height,
+width) tuples, so no image is ever pickled.
+
+    python -m market.bench --variants v5 --batch-size 16    # speedup per process count
+"""
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context, shared_memory
+
+import numpy as np
+
+from market.digits import DigitRecognizer, read_price
+from market.preprocess import DEFAULT, Options, Preprocessor
+
+# Starting size of the shared block; it is replaced by a bigger one when a batch does not fit.
+ARENA_BYTES = 1 << 20
+
+# What each worker process holds: its recognizer, preprocessor, reader and shared block.
+_worker = {}
+
+
+def recognize(grays, recognizer, preprocessor, reader=None):
+    """(text, confidence) of each grayscale crop, read one after the other."""
+    return [read_price(preprocessor.binarize(gray), recognizer, reader) for gray in grays]
+
+
+def split(items, parts):
+    """items as at most parts contiguous slices of nearly equal length."""
+    step = -(-len(items) // parts)
+    return [items[i:i + step] for i in range(0, len(items), step)]
+
+
+def _open_shared(name):
+    try:
+        # The parent owns the block; Python 3.13+ can keep workers from tracking it too.
+        return shared_memory.SharedMemory(name=name, track=False)
+    except TypeError:
+        return shared_memory.SharedMemory(name=name)
+
+
+def _init_worker(templates, labels, aspect, min_confidence, options, easyocr):
+    recognizer = DigitRecognizer(path=None, min_confidence=min_confidence)
+    recognizer.templates, recognizer.labels, recognizer.aspect = templates, labels, aspect
+    reader = None
+    if easyocr:
+        from market.ocr import LazyReader
+        reader = LazyReader()
+    _worker.update(recognizer=recognizer, preprocessor=Preprocessor(options), reader=reader, arena=None)
+
+
+def _ready(_):
+    return os.getpid()
+
+
+def _recognize_slice(name, crops):
+    """Worker side: read the crops, given as (offset, height, width), from the shared block name."""
+    arena = _worker["arena"]
+    if arena is None or arena.name != name:
+        if arena is not None:
+            arena.close()
+        arena = _worker["arena"] = _open_shared(name)
+    grays = [np.ndarray((height, width), np.uint8, arena.buf, offset) for offset, height, width in crops]
+    return recognize(grays, _worker["recognizer"], _worker["preprocessor"], _worker["reader"])
+
+
+class BatchRecognizer:
+    """Reads batches of grayscale price crops on a pool of worker processes.
+
+    Each worker starts with a copy of the recognizer's templates; what one
+    learns from EasyOCR stays in that worker. With easyocr every worker
+    loads its own model. One batch is in flight at a time, split evenly
+    between the processes.
+    """
+
+    def __init__(self, recognizer, options=DEFAULT, processes=None, easyocr=False):
+        self.processes = processes or os.cpu_count() or 1
+        # Spawned, not forked: the bot's capture and recognizer threads must not be copied mid-frame.
+        self.pool = ProcessPoolExecutor(
+            self.processes, mp_context=get_context("spawn"), initializer=_init_worker,
+            initargs=(recognizer.templates, recognizer.labels, recognizer.aspect, recognizer.min_confidence,
+                      Options(*options), easyocr))
+        self.arena = shared_memory.SharedMemory(create=True, size=ARENA_BYTES)
+        self.lock = threading.Lock()
+
+    def start(self):
+        """Start the worker processes now instead of on the first batch."""
+        list(self.pool.map(_ready, range(self.processes)))
+        return self
+
+    def __call__(self, grays):
+        """(text, confidence) of each grayscale crop, in order."""
+        if not grays:
+            return []
+        with self.lock:
+            self.reserve(sum(gray.size for gray in grays))
+            arena = np.ndarray((self.arena.size,), np.uint8, self.arena.buf)
+            crops = []
+            offset = 0
+            for gray in grays:
+                height, width = gray.shape
+                arena[offset:offset + gray.size].reshape(height, width)[:] = gray
+                crops.append((offset, height, width))
+                offset += gray.size
+            del arena
+            futures = [self.pool.submit(_recognize_slice, self.arena.name, part)
+                       for part in split(crops, self.processes)]
+            return [result for future in futures for result in future.result()]
+
+    def reserve(self, size):
+        """Make sure the shared block holds size bytes."""
+        if size <= self.arena.size:
+            return
+        size = max(size, 2 * self.arena.size)
+        self.arena.close()
+        self.arena.unlink()
+        self.arena = shared_memory.SharedMemory(create=True, size=size)
+
+    def close(self):
+        self.pool.shutdown()
+        self.arena.close()
+        self.arena.unlink()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.close()
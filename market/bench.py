@@ -0,0 +1,220 @@
+"""End-to-end latency benchmark of the bot modes against the simulated market.
+
+    python -m market.bench --variants v3 v4 v5 --cycles 300 --json bench.json
+    python -m market.bench --frames captures/      # recorded frames: <price>[_n].png
+    python -m market.bench --variants v5 --batch-size 16     # plus batch recognition on 1..N processes
+
+Reports p50/p95/p99 per stage and cycles per second, and writes JSON so runs
+can be compared across commits. With --batch-size it also reports how much
+faster a batch of crops is read on a process pool than in-process, per
+process count up to the number of cores.
+"""
+import argparse
+import json
+import logging
+import os
+import subprocess
+import time
+
+import cv2
+
+from market.batch import BatchRecognizer, recognize
+from market.digits import TEMPLATE_FILE, DigitRecognizer, PriceDecoder
+from market.modes import MODES
+from market.preprocess import DEFAULT, Options, Preprocessor
+from market.simulator import REGION, calibrate, make_feed, render_price, run
+from market.timing import StageTimes
+
+
+def load_frames(directory):
+    """Recorded price-region captures named <price>.png or <price>_<n>.png, or a replay archive."""
+    if directory.endswith(".npz"):
+        from market.replay import load_archive
+        return load_archive(directory)
+    frames = []
+    for name in sorted(os.listdir(directory)):
+        stem, ext = os.path.splitext(name)
+        if ext.lower() != ".png":
+            continue
+        price = int(stem.split("_")[0])
+        image = cv2.imread(os.path.join(directory, name), cv2.IMREAD_GRAYSCALE)
+        frames.append((price, image))
+    return frames
+
+
+def git_commit():
+    """Current commit hash, if run from a git checkout."""
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def parse_preprocess(text):
+    """'1,nearest,fixed' -> Options(1, "nearest", "fixed")."""
+    scale, interpolation, method = text.split(",")
+    return Options(int(scale), interpolation, method)
+
+
+def bench_variant(mode, feed, threshold, region, render_delay, templates, reader, preprocess=DEFAULT):
+    """Run one mode over the feed and summarize its timings."""
+    timings = StageTimes()
+    recognizer = None
+    if templates:
+        recognizer = DigitRecognizer(templates)
+        # Benchmarks only read; EasyOCR learning must not overwrite the user's template file.
+        recognizer.path = None
+    market, bot, elapsed = run(mode, feed, threshold, render_delay, region=region,
+                               recognizer=recognizer, reader=reader, timings=timings, preprocess=preprocess)
+
+    expected = [p for p in market.shown if p is not None and p <= threshold]
+    return {
+        "cycles": bot.cycles,
+        "elapsed_s": elapsed,
+        "cycles_per_second": bot.cycles / elapsed if elapsed else 0.0,
+        "correct": market.buys == expected,
+        "stages": timings.report(),
+    }
+
+
+def process_counts(limit):
+    """1, 2, 4, ... up to limit, and limit itself."""
+    counts = []
+    n = 1
+    while n < limit:
+        counts.append(n)
+        n *= 2
+    return counts + [limit]
+
+
+def bench_batch(crops, recognizer, preprocess, batch_size, processes, rounds=50, easyocr=False, reader=None):
+    """Crops per second for one batch read in-process and on pools of 1..processes workers.
+
+    crops are (price, grayscale crop) pairs, repeated to fill the batch.
+    """
+    batch = [crops[i % len(crops)] for i in range(batch_size)]
+    grays = [gray for _, gray in batch]
+    expected = [str(price) for price, _ in batch]
+    preprocessor = Preprocessor(preprocess)
+
+    recognize(grays, recognizer, preprocessor, reader)
+    start = time.perf_counter()
+    for _ in range(rounds):
+        read = recognize(grays, recognizer, preprocessor, reader)
+    sequential = rounds * batch_size / (time.perf_counter() - start)
+
+    pools = []
+    for count in process_counts(processes):
+        with BatchRecognizer(recognizer, preprocess, count, easyocr) as batcher:
+            batcher(grays)
+            start = time.perf_counter()
+            for _ in range(rounds):
+                read = batcher(grays)
+            rate = rounds * batch_size / (time.perf_counter() - start)
+        pools.append({
+            "processes": count,
+            "crops_per_second": rate,
+            "speedup": rate / sequential,
+            "efficiency": rate / sequential / count,
+            "correct": [text for text, _ in read] == expected,
+        })
+    return {"batch_size": batch_size, "cores": os.cpu_count(), "sequential_per_second": sequential, "pools": pools}
+
+
+def print_batch(result):
+    """Print the batch recognition speedups as a table."""
+    print(f"\nbatch of {result['batch_size']} crops, {result['cores']} cores: "
+          f"{result['sequential_per_second']:.0f} crops/s in-process")
+    print(f"  {'processes':>9} {'crops/s':>9} {'speedup':>8} {'efficiency':>10}")
+    for pool in result["pools"]:
+        print(f"  {pool['processes']:>9} {pool['crops_per_second']:>9.0f} {pool['speedup']:>7.2f}x "
+              f"{pool['efficiency']:>10.0%}" + ("" if pool["correct"] else "  WRONG"))
+
+
+def print_result(mode, result):
+    """Print one variant's summary as a table."""
+    print(f"\n{mode}: {result['cycles']} cycles, {result['cycles_per_second']:.1f} cycles/s, "
+          f"decisions {'correct' if result['correct'] else 'WRONG'}")
+    print(f"  {'stage':<10} {'count':>7} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}")
+    for stage, p in result["stages"].items():
+        print(f"  {stage:<10} {p['count']:>7} {p['p50_ms']:>9.3f} {p['p95_ms']:>9.3f} {p['p99_ms']:>9.3f}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the v3/v4/v5 bot modes.")
+    parser.add_argument("--variants", nargs="+", choices=sorted(MODES), default=sorted(MODES))
+    parser.add_argument("--cycles", type=int, default=200)
+    parser.add_argument("--threshold", type=int, default=19000)
+    parser.add_argument("--render-delay", type=float, default=0.01)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--frames", help="recorded price-region PNGs (directory) or replay archive instead of synthetic prices")
+    parser.add_argument("--templates", help="digit template file to use instead of calibrating on the simulator font")
+    parser.add_argument("--easyocr", action="store_true", help="enable the EasyOCR fallback")
+    parser.add_argument("--preprocess", type=parse_preprocess, default=DEFAULT, metavar="SCALE,INTERP,METHOD",
+                        help="preprocessing options, e.g. 1,nearest,fixed (default: 2,cubic,fixed)")
+    parser.add_argument("--batch-size", type=int, default=0,
+                        help="also time reading this many crops at once on a process pool")
+    parser.add_argument("--processes", type=int, default=os.cpu_count(),
+                        help="largest process pool to time with --batch-size")
+    parser.add_argument("--json", help="write results to this file")
+    args = parser.parse_args(argv)
+
+    # The bot logs every read; keep that out of the measurement output.
+    logging.basicConfig(level=logging.WARNING, format="%(message)s")
+
+    region = REGION
+    templates = args.templates
+    if args.frames:
+        # Recorded frames are in the game font, so use the calibrated templates.
+        templates = templates or TEMPLATE_FILE
+        feed = load_frames(args.frames)
+        height, width = feed[0][1].shape
+        region = dict(REGION, width=width, height=height)
+    else:
+        feed = make_feed(args.cycles, args.threshold, seed=args.seed)
+
+    reader = None
+    if args.easyocr:
+        import easyocr
+        reader = easyocr.Reader(['en'], gpu=False)
+
+    results = {}
+    for mode in args.variants:
+        results[mode] = bench_variant(mode, feed, args.threshold, region, args.render_delay, templates, reader,
+                                      args.preprocess)
+        print_result(mode, results[mode])
+
+    batch = None
+    if args.batch_size:
+        if args.frames:
+            crops = feed
+            recognizer = DigitRecognizer(templates)
+        else:
+            crops = [(price, render_price(price, REGION["width"], REGION["height"])) for price in feed]
+            recognizer = DigitRecognizer(templates) if templates else DigitRecognizer(path=None)
+            if not templates:
+                calibrate(recognizer, PriceDecoder(recognizer, preprocessor=Preprocessor(args.preprocess)))
+        # Timing runs read only; nothing they learn is written back to the template file.
+        recognizer.path = None
+        batch = bench_batch(crops, recognizer, args.preprocess, args.batch_size, args.processes,
+                            easyocr=args.easyocr, reader=reader)
+        print_batch(batch)
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({
+                "commit": git_commit(),
+                "timestamp": time.time(),
+                "cycles": len(feed),
+                "render_delay": args.render_delay,
+                "source": args.frames or "synthetic",
+                "preprocess": args.preprocess._asdict(),
+                "variants": results,
+                "batch": batch,
+            }, f, indent=4)
+        print(f"\n✅ Results written to {args.json}")
+
+
+if __name__ == "__main__":
+    main()
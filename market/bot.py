@@ -0,0 +1,307 @@
+import logging
+import time
+from collections import deque
+
+import numpy as np
+
+from market.control import Control
+from market.pipeline import Pipeline
+from market.regions import PRICE, RegionSet
+from market.scheduler import Scheduler
+from market.timing import NO_TIMING
+from market.waits import around, snapshot, wait_for_region_change
+
+log = logging.getLogger("market")
+
+# Pause between the confirming re-reads of a price about to be bought.
+CONFIRM_GAP = 0.003
+
+# A price shorter than this many recent reads in a row is double-checked:
+# more re-reads, spaced out so a digit that has not rendered yet shows up.
+DIGIT_HISTORY = 10
+SUSPECT_READS = 3
+SUSPECT_GAP = 0.01
+
+# Pause after a purchase that did not go through, doubling while they keep failing.
+OUTCOME_BACKOFF = 0.5
+MAX_OUTCOME_BACKOFF = 30.0
+
+
+class Bot:
+    """Snipe loop state, independent of where pixels come from and clicks go.
+
+    coords maps button names (follow, return, max, purchase, confirm) to
+    screen coordinates; a mode only uses the buttons it needs. items is the
+    watchlist: each WatchItem brings its own item slot, price region and
+    threshold, and the scheduler picks which one each cycle looks at.
+
+    Before buying, the price is re-read confirm_reads times straight from the
+    screen and every re-read must agree. Reads below min_confidence are never
+    bought, and a price with fewer digits than every recent one gets extra
+    re-reads. With an OutcomeChecker, the result dialog after each buy is
+    classified and failed or unconfirmed purchases back off. A FrameRecorder
+    (recorder) keeps every distinct price frame with the price read from it.
+    control pauses, resumes and stops the bot: a stop cuts the current
+    cycle's waits short, but a purchase that has started is finished first.
+
+    adaptive, if given, makes an AdaptiveThreshold from an item's configured
+    threshold. reload, if given, is called between cycles and returns
+    (coords, items) when the configuration has changed, else None.
+    """
+
+    def __init__(self, capture, mouse, coords, items, decode, scan_interval,
+                 button_timeout=0.2, ui_timeout=1.0, max_frame_age=0.25, workers=2, history=None,
+                 poller=None, confirm_reads=2, min_confidence=0.6, outcome=None, adaptive=None, reload=None,
+                 recorder=None, control=None, timings=NO_TIMING):
+        self.capture = capture
+        self.mouse = mouse
+        self.coords = coords
+        self.adaptive = adaptive
+        self.reload = reload
+        self.poller = poller
+        self.items = []
+        self.digit_counts = {}
+        self.set_items(items)
+        self.item = self.items[0]
+        self.decode = decode
+        self.confirm_reads = confirm_reads
+        self.min_confidence = min_confidence
+        self.outcome = outcome
+        self.failures = 0
+        self.scan_interval = scan_interval
+        self.button_timeout = button_timeout
+        self.ui_timeout = ui_timeout
+        self.history = history
+        self.recorder = recorder
+        self.timings = timings
+        self.pipeline = Pipeline(capture, decode, workers=workers, max_age=max_frame_age, timings=timings)
+        self.control = control or Control()
+        # A stop ends a pending read at once; the cycle then returns to the list as on a timeout.
+        self.control.on_stop(self.pipeline.stop)
+        self.cycles = 0
+
+    def run(self, mode):
+        """Run a mode's cycle until stopped. This is the actor thread; nothing else clicks."""
+        self.pipeline.start()
+        try:
+            while self.control.proceed():
+                changed = self.reload() if self.reload else None
+                if changed:
+                    self.coords, items = changed
+                    self.set_items(items)
+                start = time.perf_counter()
+                self.item = self.scheduler.next()
+                number = self.cycle(mode)
+                # The poller compares against last_price, which done() updates.
+                idle = self.poller.update(self.item, number) if self.poller else 0.0
+                self.scheduler.done(self.item, number)
+                self.cycles += 1
+                self.timings.since("cycle", start)
+                if idle:
+                    start = time.perf_counter()
+                    self.control.sleep(idle)
+                    self.timings.since("idle", start)
+        except Exception as e:
+            log.exception(f"❌ Error: {e}")
+        finally:
+            self.control.stop()
+
+    def set_items(self, items):
+        """Watch a new list of items, keeping what was learned about the ones already watched."""
+        known = {item.name: item for item in self.items}
+        merged = []
+        for item in items:
+            old = known.get(item.name)
+            if old:
+                old.coords, old.region, old.fields = item.coords, item.region, item.fields
+                old.threshold, old.priority = item.threshold, item.priority
+                if old.adaptive:
+                    old.adaptive.fallback = item.threshold
+                item = old
+            elif self.adaptive:
+                item.adaptive = self.adaptive(item.threshold)
+            merged.append(item)
+
+        self.items = merged
+        self.scheduler = Scheduler(merged)
+        self.regions = {item: RegionSet({PRICE: item.region, **item.fields}) for item in merged}
+        self.digit_counts = {item: self.digit_counts.get(item) or deque(maxlen=DIGIT_HISTORY) for item in merged}
+        if self.poller:
+            self.poller.retain(merged)
+
+    def position(self, name):
+        """Screen coordinates of a button; "item" is the current watchlist item's slot."""
+        return self.item.coords if name == "item" else self.coords[name]
+
+    def prefix(self):
+        """Item name to put in front of log lines, when there is more than one item."""
+        return f"[{self.item.name}] " if len(self.items) > 1 else ""
+
+    def click(self, name):
+        """Click a configured button and return its coordinates."""
+        x, y = self.position(name)
+        start = time.perf_counter()
+        self.mouse.click(x, y)
+        self.timings.since("click", start)
+        return x, y
+
+    def click_and_wait(self, name, watch, timeout):
+        """Click a button and wait for the watched region to react."""
+        before = snapshot(self.capture, watch)
+        x, y = self.click(name)
+        wait_for_region_change(self.capture, watch, timeout, before, self.control.interrupt)
+        return x, y
+
+    def cycle(self, mode):
+        """One pass of a mode over the current item: before steps, open and read it, then buy or return.
+
+        Returns the price read, or None.
+        """
+        for step in mode.before:
+            self.step(step)
+        reading = self.open_item()
+        if reading is None:
+            return None
+        number, buy = self.decide(reading)
+        if buy and not self.control.running:
+            log.info(f"{self.prefix()}🛑 Stopping: not buying {number}")
+            buy = False
+        pause = 0.0
+        if number is not None:
+            if buy:
+                # Once the first buy click is out, finish the purchase even if a stop comes in.
+                with self.control.atomic():
+                    for step in mode.buy:
+                        self.step(step)
+                    log.info(f"{self.prefix()}✅ Purchased item because {number} ≤ {self.item.threshold}")
+                    if self.outcome:
+                        pause = self.verify_purchase(number)
+            else:
+                self.skip(number)
+        self.close_item(reading)
+        if pause:
+            self.control.sleep(pause)
+        return number
+
+    def step(self, step):
+        """Click a step's button and wait for its watched button area to react."""
+        if step.watch:
+            x, y = self.click_and_wait(step.button, around(*self.position(step.watch)), self.button_timeout)
+        else:
+            x, y = self.click(step.button)
+        log.debug(step.message.format(x=x, y=y))
+
+    def open_item(self):
+        """Open the item and return a fresh pipeline reading, or None after returning."""
+        regions = self.regions[self.item]
+        before = snapshot(self.capture, regions.bounds)
+        self.pipeline.arm(regions, before)
+        x, y = self.click("item")
+        log.debug(f"🟦 Opened item at ({x}, {y})")
+        reading = self.pipeline.read(self.ui_timeout)
+        self.pipeline.disarm()
+        if reading is None:
+            if self.control.running:
+                log.warning(f"{self.prefix()}⚠️ No fresh price reading — returning.")
+            self.click("return")
+        return reading
+
+    def read_number(self, reading):
+        """Parse the reading into a price, returning (and clicking return) if there is none."""
+        # Recognition only ever yields digits and commas, so any text is a price.
+        text = (reading.text or "").replace(",", "")
+        if not text:
+            log.info(f"{self.prefix()}No number detected — returning.")
+            self.click("return")
+            return None
+
+        number = int(text)
+        # The scheduler records last_price once the cycle is done.
+        if number != self.item.last_price:
+            log.info(f"{self.prefix()}Detected number: {number}")
+        if reading.fields:
+            log.debug(f"{self.prefix()}" + ", ".join(f"{name} {text}" for name, text in reading.fields.items()))
+        return number
+
+    def decide(self, reading):
+        """Returns (number, buy); number is None when the reading was not a price."""
+        start = time.perf_counter()
+        number = self.read_number(reading)
+        adaptive = self.item.adaptive
+        if adaptive:
+            # Judge this price against the ones before it, then add it to the window.
+            self.item.threshold = adaptive.threshold()
+            if number is not None:
+                adaptive.observe(number)
+        buy = number is not None and number <= self.item.threshold
+        self.timings.since("decision", start)
+        if buy:
+            buy = self.confirm(reading, number)
+        if number is not None:
+            self.digit_counts[self.item].append(len(str(number)))
+        if self.history and number is not None:
+            self.history.record(self.item.name, number, reading.confidence, "buy" if buy else "skip")
+        if self.recorder and number is not None:
+            regions = self.regions[self.item]
+            pixels = np.frombuffer(reading.raw, np.uint8).reshape(regions.buffer.shape)
+            self.recorder.add(regions.views(pixels)[PRICE], number, self.item.name)
+        return number, buy
+
+    def confirm(self, reading, number):
+        """Vet a buy: read confidence, then fresh re-reads that must agree (more if the digit count is suspect)."""
+        start = time.perf_counter()
+        try:
+            if reading.confidence < self.min_confidence:
+                log.warning(f"{self.prefix()}⚠️ Not buying {number}: read confidence {reading.confidence:.2f}")
+                return False
+            reads, gap = self.confirm_reads, CONFIRM_GAP
+            counts = self.digit_counts[self.item]
+            # A dropped digit turns 190000 into 19000; prices rarely lose a digit for real.
+            if len(counts) == counts.maxlen and min(counts) > len(str(number)):
+                log.info(f"{self.prefix()}🔍 {number} is shorter than the last {len(counts)} prices, double-checking")
+                reads, gap = max(reads, SUSPECT_READS), SUSPECT_GAP
+            price_region = self.regions[self.item].regions[PRICE]
+            for _ in range(reads):
+                time.sleep(gap)
+                text, _ = self.decode(self.capture.grab(price_region))
+                if (text or "").replace(",", "") != str(number):
+                    log.warning(f"{self.prefix()}⚠️ Not buying {number}: re-read as {text}")
+                    return False
+            return True
+        finally:
+            self.timings.since("confirm", start)
+
+    def verify_purchase(self, number):
+        """Classify the result dialog. Returns how long to back off before the next cycle: 0 after a success.
+
+        A dialog that matches no reference (slow, or just different) is
+        recorded as unknown and backed off from like a failure; a buy button
+        is never clicked again, since that could buy twice.
+        """
+        start = time.perf_counter()
+        outcome, score = self.outcome.wait(self.capture, self.ui_timeout)
+        self.timings.since("verify", start)
+
+        if self.history:
+            self.history.record(self.item.name, number, score, outcome or "unknown")
+        if "dismiss" in self.coords:
+            self.click("dismiss")
+        if outcome == "success":
+            self.failures = 0
+            log.info(f"{self.prefix()}🎉 Purchase of {number} went through")
+            return 0.0
+        self.failures += 1
+        pause = min(OUTCOME_BACKOFF * 2 ** (self.failures - 1), MAX_OUTCOME_BACKOFF)
+        log.warning(f"{self.prefix()}⚠️ Purchase of {number} {'failed' if outcome else 'not confirmed'} "
+                    f"({self.failures} in a row), pausing {pause:.1f}s")
+        return pause
+
+    def close_item(self, reading):
+        """Start the next cycle as soon as the item view has closed."""
+        wait_for_region_change(self.capture, self.regions[self.item].bounds, self.scan_interval, reading.raw,
+                               self.control.interrupt)
+
+    def skip(self, number):
+        """Return to the list without buying."""
+        self.click("return")
+        log.debug(f"{self.prefix()}↩️ Returned (price {number} > {self.item.threshold})")
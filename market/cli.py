@@ -0,0 +1,273 @@
+"""Single entry point for every bot mode.
+
+    python -m market --mode v5 --configure   # capture buttons, price region, threshold
+    python -m market --mode v5               # run
+    python -m market --add-item ore          # watch another item as well
+
+Saving config.json while the bot runs applies the new buttons, regions and
+thresholds from the next cycle on; the OCR model stays loaded.
+
+Heavy dependencies (OpenCV, mss, EasyOCR/torch, keyboard) are imported only
+by the code paths that use them: configuring needs none of them, and EasyOCR
+is loaded only if the digit templates cannot read a price. With
+`python -m market.ocr_worker` running, the bot borrows its warm model instead.
+"""
+import argparse
+import logging
+import threading
+import time
+from functools import partial
+
+from market.config import (CONFIG_FILE, ConfigError, configure, configure_item, configure_outcome, load_config,
+                           missing)
+from market.modes import BUTTON_PROMPTS, MODES, buttons
+
+log = logging.getLogger("market")
+
+
+def worker_address(text):
+    from market.ocr_worker import parse_address
+    return parse_address(text)
+
+
+def percentile(text):
+    """A percentile strictly between 0 and 100."""
+    value = float(text)
+    if not 0 < value < 100:
+        raise argparse.ArgumentTypeError(f"expected a percentile between 0 and 100, got {text}")
+    return value
+
+
+def parse_args(argv=None):
+    """Command line options; timing defaults match the old per-script constants."""
+    parser = argparse.ArgumentParser(prog="python -m market", description="Market price watcher bot.")
+    parser.add_argument("--mode", choices=sorted(MODES), default="v5",
+                        help="; ".join(f"{m.name}: {m.description}" for m in MODES.values()))
+    parser.add_argument("--configure", action="store_true", help="capture coordinates instead of running")
+    parser.add_argument("--add-item", metavar="NAME",
+                        help="capture another item's slot, price region and threshold for the watchlist")
+    parser.add_argument("--capture-outcome", choices=("success", "failure"),
+                        help="save what the purchase result dialog looks like, so buys can be verified")
+    parser.add_argument("--config", default=CONFIG_FILE)
+    parser.add_argument("--scan-interval", type=float,
+                        help="longest wait for the listing to close before the next cycle (default: per mode)")
+    parser.add_argument("--min-scan-interval", type=float, default=0.0,
+                        help="idle time between cycles right after a price change")
+    parser.add_argument("--max-scan-interval", type=float,
+                        help="longest idle time between cycles while prices stay the same "
+                             "(default: the mode's scan interval; 0 never idles)")
+    parser.add_argument("--button-timeout", type=float, default=0.2,
+                        help="longest wait for a button click to show on screen")
+    parser.add_argument("--ui-timeout", type=float, default=1.0, help="longest wait for the item view to open")
+    parser.add_argument("--max-frame-age", type=float, default=0.25,
+                        help="never act on a price captured longer ago than this")
+    parser.add_argument("--workers", type=int, default=2, help="recognizer threads")
+    parser.add_argument("--confirm-reads", type=int, default=2,
+                        help="fresh re-reads of a price that must agree before buying")
+    parser.add_argument("--min-buy-confidence", type=float, default=0.6,
+                        help="never buy on a read less confident than this")
+    parser.add_argument("--no-ocr-fallback", action="store_true",
+                        help="only use the digit templates; never load EasyOCR")
+    parser.add_argument("--ocr-worker", type=worker_address, default=None, metavar="HOST:PORT",
+                        help="address of a running market.ocr_worker (default: the worker's default address)")
+    parser.add_argument("--no-ocr-worker", action="store_true",
+                        help="load EasyOCR in this process even if a worker is running")
+    parser.add_argument("--log-level", type=str.upper, choices=("DEBUG", "INFO", "WARNING", "ERROR"), default="INFO",
+                        help="DEBUG shows every click")
+    parser.add_argument("--stats-interval", type=float, default=10.0, help="seconds between stats summaries")
+    parser.add_argument("--trace", help="dump per-stage timings to this .csv or .jsonl file on exit")
+    parser.add_argument("--adaptive-threshold", type=percentile, metavar="PERCENTILE",
+                        help="buy below this percentile of recently seen prices instead of the fixed threshold")
+    parser.add_argument("--adaptive-window", type=int, default=200, help="recent prices the percentile is taken over")
+    parser.add_argument("--adaptive-min-samples", type=int, default=20,
+                        help="prices to see before the adaptive threshold replaces the configured one")
+    parser.add_argument("--max-threshold", type=int, help="never let the adaptive threshold go above this")
+    parser.add_argument("--history", help="append every price read to this file (see python -m market.history)")
+    parser.add_argument("--record-frames", metavar="FILE.npz",
+                        help="save every distinct price frame and its reading here on exit (see python -m market.replay)")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    """Configure or run the selected mode. Returns the process exit code."""
+    args = parse_args(argv)
+    mode = MODES[args.mode]
+    print(f"=== Price Watcher Bot ({mode.name}) ===")
+    try:
+        return start(mode, args)
+    except ConfigError as e:
+        print(f"❌ Invalid configuration in {args.config}:\n{e}")
+        return 1
+
+
+def start(mode, args):
+    """Run whichever configure step was asked for, or load the configuration and run the bot."""
+    if args.configure:
+        from market.backends import PyAutoGuiInput
+        configure({name: BUTTON_PROMPTS[name] for name in buttons(mode)}, PyAutoGuiInput(), args.config)
+        print("✅ Configuration complete. Run again without --configure to start.")
+        return 0
+    if args.add_item:
+        from market.backends import PyAutoGuiInput
+        configure_item(args.add_item, PyAutoGuiInput(), args.config)
+        print(f"✅ Added {args.add_item} to the watchlist.")
+        return 0
+    if args.capture_outcome:
+        from market.backends import MssCapture, PyAutoGuiInput
+        configure_outcome(args.capture_outcome, MssCapture(), PyAutoGuiInput(), args.config)
+        return 0
+
+    config = load_config(args.config)
+    gaps = missing(config, buttons(mode))
+    if gaps:
+        print(f"❌ Missing configuration ({', '.join(gaps)}). "
+              f"Please run again with --mode {mode.name} --configure.")
+        return 1
+
+    print("Using configuration:")
+    for name in buttons(mode):
+        if name != "item":
+            print(f"{BUTTON_PROMPTS[name] + ':':<20}{config.buttons[name]}")
+    for item in config.items:
+        print(f"{'Item ' + item.name + ':':<20}{item.coords}, region {item.region}, "
+              f"threshold {item.threshold}, priority {item.priority}")
+    print()
+    return run(mode, config, args)
+
+
+def run(mode, config, args):
+    """Start the bot and block until it stops."""
+    import keyboard  # for global hotkey detection
+    from market.backends import MssCapture, PyAutoGuiInput
+    from market.adaptive import AdaptiveThreshold
+    from market.bot import Bot
+    from market.config import ConfigWatcher, watch_item
+    from market.digits import DigitRecognizer, PriceDecoder
+    from market.history import HistoryWriter
+    from market.ocr import LazyReader
+    from market.ocr_worker import ADDRESS, RemoteReader
+    from market.outcome import OutcomeChecker
+    from market.polling import AdaptivePoller
+    from market.preprocess import DEFAULT, Preprocessor
+    from market.replay import FrameRecorder
+    from market.timing import StageTimes, StatsReporter
+
+    logging.basicConfig(level=args.log_level, format="%(message)s")
+    adaptive = None
+    if args.adaptive_threshold is not None:
+        adaptive = partial(AdaptiveThreshold, percentile=args.adaptive_threshold, window=args.adaptive_window,
+                           min_samples=args.adaptive_min_samples, ceiling=args.max_threshold)
+        log.info(f"Adaptive threshold: {args.adaptive_threshold:g}th percentile of the last "
+                 f"{args.adaptive_window} prices")
+    timings = StageTimes()
+    recognizer = DigitRecognizer()
+    reader = None
+    if not args.no_ocr_fallback:
+        address = args.ocr_worker or ADDRESS
+        reader = None if args.no_ocr_worker else RemoteReader.connect(address)
+        if reader:
+            log.info(f"Using OCR worker at {address[0]}:{address[1]}")
+        else:
+            reader = LazyReader()
+            # Templates missing digits mean early reads will need EasyOCR: have it warm by then.
+            if len(recognizer.known_digits()) < 10:
+                reader.warmup()
+    options = config.preprocess or DEFAULT
+    log.info(f"Preprocessing: {options[0]}x {options[1]}, {options[2]} threshold")
+    decoder = PriceDecoder(recognizer, reader, preprocessor=Preprocessor(options, timings), timings=timings)
+    outcome = OutcomeChecker.load(config.result_region)
+    if config.result_region and outcome is None:
+        log.warning("⚠️ Purchase check off: capture both outcomes (--capture-outcome success / failure)")
+    watcher = ConfigWatcher(args.config)
+
+    def reload():
+        """New (coords, items) if config.json was saved with a valid configuration since last time."""
+        nonlocal config
+        try:
+            new = watcher.poll()
+        except ConfigError as e:
+            log.error(f"❌ Not reloading {args.config}:\n{e}")
+            return None
+        if new is None:
+            return None
+        gaps = missing(new, buttons(mode))
+        if gaps:
+            log.error(f"❌ Not reloading {args.config}: missing {', '.join(gaps)}")
+            return None
+        if new.preprocess != config.preprocess:
+            decoder.preprocessor = Preprocessor(new.preprocess or DEFAULT, timings)
+            # Keys are binarized frames; under the new options they would never match again.
+            decoder.frame_cache.clear()
+        if outcome and new.result_region:
+            outcome.region = new.result_region
+        config = new
+        log.info(f"🔄 Reloaded {args.config}: {len(new.items)} items, "
+                 f"thresholds {', '.join(str(item.threshold) for item in new.items)}")
+        return dict(new.buttons), [watch_item(item) for item in new.items]
+
+    scan_interval = args.scan_interval if args.scan_interval is not None else mode.scan_interval
+    poller = AdaptivePoller(args.min_scan_interval,
+                            args.max_scan_interval if args.max_scan_interval is not None else scan_interval)
+    bot = Bot(
+        MssCapture(), PyAutoGuiInput(), dict(config.buttons), [watch_item(item) for item in config.items],
+        decoder, scan_interval,
+        button_timeout=args.button_timeout, ui_timeout=args.ui_timeout,
+        max_frame_age=args.max_frame_age, workers=args.workers,
+        history=HistoryWriter(args.history) if args.history else None, poller=poller,
+        confirm_reads=args.confirm_reads, min_confidence=args.min_buy_confidence,
+        outcome=outcome, adaptive=adaptive, reload=reload,
+        recorder=FrameRecorder(args.record_frames) if args.record_frames else None, timings=timings,
+    )
+    reporter = StatsReporter(timings, args.stats_interval,
+                             extra=lambda: f"{poller.summary()} | cache {decoder.frame_cache.summary()}")
+
+    control = bot.control
+
+    def stop_bot():
+        if control.running:
+            log.info("🛑 Stop signal received. Stopping bot safely...")
+        control.stop()
+
+    def toggle_pause():
+        if control.toggle():
+            log.info("⏸️ Pausing after this cycle. Press F9 to resume.")
+        else:
+            log.info("▶️ Resumed.")
+
+    # keyboard calls these from its own listener thread; nothing here polls.
+    keyboard.add_hotkey('ctrl+c', stop_bot)
+    keyboard.add_hotkey('f8', stop_bot)
+    keyboard.add_hotkey('f9', toggle_pause)
+    log.info("Bot started. Press Ctrl+C OR F8 to stop, F9 to pause/resume (works globally).\n")
+
+    # The actor thread owns the mouse; capture and OCR run on the bot's pipeline threads.
+    actor = threading.Thread(target=bot.run, args=(mode,), name="actor")
+    actor.start()
+    reporter.start()
+
+    try:
+        # A bounded join so Ctrl+C in the console still reaches this thread on Windows.
+        while actor.is_alive():
+            actor.join(0.5)
+    except KeyboardInterrupt:
+        stop_bot()
+        actor.join()
+
+    finally:
+        keyboard.unhook_all()
+        if control.stop_requested is not None:
+            log.info(f"Stopped {(time.perf_counter() - control.stop_requested) * 1000:.1f}ms after the stop request")
+        reporter.stop()
+        log.info(f"Pipeline: {bot.pipeline.ring.dropped} frames dropped, {bot.pipeline.stale} stale reads")
+        if args.trace:
+            rows = timings.dump_trace(args.trace)
+            log.info(f"Wrote {rows} timing rows to {args.trace}")
+        if bot.history:
+            bot.history.close()
+            log.info(f"Recorded {bot.history.written} prices to {args.history}")
+        if bot.recorder:
+            log.info(f"Saved {bot.recorder.save()} price frames to {args.record_frames}")
+        log.info("Bot stopped.")
+        for handler in logging.getLogger().handlers + log.handlers:
+            handler.flush()
+    return 0
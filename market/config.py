@@ -0,0 +1,383 @@
+"""config.json: a versioned schema, migration from older layouts, validation and hot reload.
+
+Current layout (VERSION 2):
+
+    {
+        "VERSION": 2,
+        "BUTTONS": {"follow": [x, y], "return": [x, y], "max": ..., "purchase": ..., "confirm": ...},
+        "WATCHLIST": [
+            {"NAME": "item", "ITEM": [x, y], "REGION": {"top": 0, "left": 0, "width": 0, "height": 0},
+             "THRESHOLD_VALUE": 19000, "PRIORITY": 1, "FIELDS": {"quantity": {...}}}
+        ],
+        "PREPROCESS": {"SCALE": 2, "INTERPOLATION": "cubic", "METHOD": "fixed"},
+        "RESULT_REGION": {...}
+    }
+
+Files without VERSION are the flat layout written by marketv3/v4/v5 (FOLLOW_X,
+ITEM_X, ..., REGION, THRESHOLD_VALUE) and are migrated when read; the next
+save writes them back as version 2.
+"""
+import json
+import math
+import os
+import time
+from collections import namedtuple
+
+from market.regions import PRICE
+from market.scheduler import WatchItem
+
+CONFIG_FILE = "config.json"
+CONFIG_VERSION = 2
+DEFAULT_THRESHOLD = 19000
+DEFAULT_ITEM = "item"
+
+# Seconds between checks of config.json for changes while running.
+RELOAD_INTERVAL = 1.0
+
+# Button name -> key prefix in the flat version 1 layout (FOLLOW_X, FOLLOW_Y, ...).
+BUTTON_KEYS = {
+    "follow": "FOLLOW",
+    "item": "ITEM",
+    "return": "RETURN",
+    "max": "MAX_ITEM",
+    "purchase": "CLICK",
+    "confirm": "CONFIRM",
+    "dismiss": "DISMISS",
+}
+
+# Values market.preprocess understands.
+INTERPOLATIONS = ("nearest", "linear", "cubic")
+METHODS = ("fixed", "otsu", "adaptive")
+
+ItemConfig = namedtuple("ItemConfig", "name coords region threshold priority fields")
+Config = namedtuple("Config", "buttons items preprocess result_region")
+
+EMPTY = Config({}, (), None, None)
+
+
+class ConfigError(ValueError):
+    """config.json is unreadable or invalid; the message lists every problem."""
+
+
+def read_config(path=CONFIG_FILE):
+    """config.json contents in the current layout, or an empty config if there is none yet."""
+    if not os.path.exists(path):
+        return {"VERSION": CONFIG_VERSION}
+    try:
+        with open(path, "r") as f:
+            data = json.load(f)
+    except json.JSONDecodeError as e:
+        raise ConfigError(f"{path} is not valid JSON: {e}") from None
+    except (OSError, ValueError) as e:
+        # Also what a half-written file looks like while an editor is saving it.
+        raise ConfigError(f"cannot read {path}: {e}") from None
+    return migrate(data)
+
+
+def write_config(data, path=CONFIG_FILE):
+    """Validate and replace config.json with data."""
+    parse(data)
+    with open(path, "w") as f:
+        json.dump(data, f, indent=4)
+    print(f"✅ Configuration saved to {path}\n")
+
+
+def migrate(data):
+    """Bring a config dict of any known layout up to CONFIG_VERSION."""
+    if not isinstance(data, dict):
+        raise ConfigError(f"expected a JSON object at the top level, got {type(data).__name__}")
+    version = data.get("VERSION", 1)
+    if not isinstance(version, int) or isinstance(version, bool) or version < 1:
+        raise ConfigError(f"VERSION: expected a whole number >= 1, got {version!r}")
+    if version > CONFIG_VERSION:
+        raise ConfigError(f"config version {version} is newer than this bot understands ({CONFIG_VERSION})")
+    if version == 1:
+        data = _migrate_flat(data)
+    return data
+
+
+def _migrate_flat(data):
+    """Version 1: the flat marketv3/v4/v5 layout, plus the keys later added to it."""
+    buttons = {}
+    for name, key in BUTTON_KEYS.items():
+        x, y = data.get(f"{key}_X"), data.get(f"{key}_Y")
+        if x is not None and y is not None:
+            buttons[name] = [x, y]
+
+    watchlist = []
+    item = buttons.pop("item", None)
+    if item and data.get("REGION"):
+        # v3 never saved a threshold; it used the same default.
+        entry = {"NAME": data.get("ITEM_NAME", DEFAULT_ITEM), "ITEM": item, "REGION": data["REGION"],
+                 "THRESHOLD_VALUE": data.get("THRESHOLD_VALUE", DEFAULT_THRESHOLD),
+                 "PRIORITY": data.get("PRIORITY", 1)}
+        if data.get("FIELDS"):
+            entry["FIELDS"] = data["FIELDS"]
+        watchlist.append(entry)
+    old_items = data.get("WATCHLIST", [])
+    if not isinstance(old_items, list):
+        raise ConfigError(f"WATCHLIST: expected a list of items, got {old_items!r}")
+    for old in old_items:
+        if not isinstance(old, dict):
+            # parse() reports it along with everything else.
+            watchlist.append(old)
+            continue
+        entry = {key: value for key, value in old.items() if key not in ("ITEM_X", "ITEM_Y")}
+        entry["ITEM"] = [old.get("ITEM_X"), old.get("ITEM_Y")]
+        watchlist.append(entry)
+
+    migrated = {"VERSION": CONFIG_VERSION, "BUTTONS": buttons, "WATCHLIST": watchlist}
+    for key in ("PREPROCESS", "RESULT_REGION"):
+        if data.get(key):
+            migrated[key] = data[key]
+    return migrated
+
+
+def _is_int(value):
+    # JSON true/false load as bools, which Python counts as ints.
+    return isinstance(value, int) and not isinstance(value, bool)
+
+
+def _is_number(value):
+    """A finite int or float; json accepts Infinity and NaN."""
+    return isinstance(value, (int, float)) and not isinstance(value, bool) and math.isfinite(value)
+
+
+def _check_point(value, where, errors):
+    if isinstance(value, (list, tuple)) and len(value) == 2 and all(_is_int(v) for v in value):
+        return tuple(value)
+    errors.append(f"{where}: expected [x, y] in whole pixels, got {value!r}")
+    return None
+
+
+def _check_region(value, where, errors):
+    keys = ("top", "left", "width", "height")
+    if not isinstance(value, dict) or any(not _is_int(value.get(k)) for k in keys):
+        errors.append(f"{where}: expected {{top, left, width, height}} in whole pixels, got {value!r}")
+        return None
+    if value["width"] <= 0 or value["height"] <= 0:
+        errors.append(f"{where}: width and height must be positive, got {value['width']}x{value['height']}")
+        return None
+    return {k: value[k] for k in keys}
+
+
+def _section(data, key, kind, errors, where=None):
+    """data[key] if it is a kind (dict or list); otherwise records the problem and returns an empty one."""
+    value = data.get(key)
+    if value is None:
+        return kind()
+    if not isinstance(value, kind):
+        errors.append(f"{where or key}: expected {'an object' if kind is dict else 'a list'}, got {value!r}")
+        return kind()
+    return value
+
+
+def parse(data):
+    """Validate a current-layout config dict into a Config; raises ConfigError listing every problem."""
+    if not isinstance(data, dict):
+        raise ConfigError(f"expected a JSON object at the top level, got {type(data).__name__}")
+    errors = []
+    buttons = {}
+    for name, value in _section(data, "BUTTONS", dict, errors).items():
+        if name not in BUTTON_KEYS or name == "item":
+            errors.append(f"BUTTONS: unknown button {name!r}")
+        elif (point := _check_point(value, f"BUTTONS.{name}", errors)) is not None:
+            buttons[name] = point
+
+    items = []
+    names = set()
+    for i, entry in enumerate(_section(data, "WATCHLIST", list, errors)):
+        if not isinstance(entry, dict):
+            errors.append(f"WATCHLIST[{i}]: expected an object, got {entry!r}")
+            continue
+        name = entry.get("NAME")
+        where = f"WATCHLIST[{i}]" + (f" ({name})" if isinstance(name, str) and name else "")
+        if not isinstance(name, str) or not name:
+            errors.append(f"{where}: NAME must be a non-empty string")
+        elif name in names:
+            errors.append(f"{where}: duplicate NAME")
+        else:
+            names.add(name)
+        coords = _check_point(entry.get("ITEM"), f"{where}.ITEM", errors)
+        region = _check_region(entry.get("REGION"), f"{where}.REGION", errors)
+        threshold = entry.get("THRESHOLD_VALUE", DEFAULT_THRESHOLD)
+        if not _is_int(threshold) or threshold <= 0:
+            errors.append(f"{where}.THRESHOLD_VALUE: expected a positive whole number, got {threshold!r}")
+        priority = entry.get("PRIORITY", 1)
+        if not _is_number(priority) or priority <= 0:
+            errors.append(f"{where}.PRIORITY: expected a positive number, got {priority!r}")
+        fields = {}
+        for field, value in _section(entry, "FIELDS", dict, errors, f"{where}.FIELDS").items():
+            if field == PRICE:
+                # It would silently replace the item's own REGION in the combined grab.
+                errors.append(f"{where}.FIELDS: {PRICE!r} is the item's REGION, not an extra field")
+                continue
+            fields[field] = _check_region(value, f"{where}.FIELDS.{field}", errors)
+        items.append(ItemConfig(name, coords, region, threshold, priority, fields))
+
+    preprocess = data.get("PREPROCESS")
+    if preprocess is not None and not isinstance(preprocess, dict):
+        errors.append(f"PREPROCESS: expected an object, got {preprocess!r}")
+        preprocess = None
+    if preprocess is not None:
+        scale, interpolation, method = (preprocess.get(k) for k in ("SCALE", "INTERPOLATION", "METHOD"))
+        if not _is_int(scale) or scale < 1:
+            errors.append(f"PREPROCESS.SCALE: expected a whole number >= 1, got {scale!r}")
+        if interpolation not in INTERPOLATIONS:
+            errors.append(f"PREPROCESS.INTERPOLATION: expected one of {', '.join(INTERPOLATIONS)}, "
+                          f"got {interpolation!r}")
+        if method not in METHODS:
+            errors.append(f"PREPROCESS.METHOD: expected one of {', '.join(METHODS)}, got {method!r}")
+        preprocess = (scale, interpolation, method)
+
+    result_region = data.get("RESULT_REGION")
+    if result_region is not None:
+        result_region = _check_region(result_region, "RESULT_REGION", errors)
+
+    if errors:
+        raise ConfigError("\n".join(errors))
+    return Config(buttons, tuple(items), preprocess, result_region)
+
+
+def load_config(path=CONFIG_FILE):
+    """Read, migrate and validate config.json. Returns a Config (EMPTY if there is no file)."""
+    if not os.path.exists(path):
+        return EMPTY
+    config = parse(read_config(path))
+    print(f"✅ Loaded configuration from {path}\n")
+    return config
+
+
+def missing(config, needed):
+    """What config lacks to run a mode that clicks the needed buttons."""
+    # The item slot is per watchlist item; every other button is shared.
+    gaps = [name for name in needed if name != "item" and name not in config.buttons]
+    if not config.items:
+        gaps.append("item slot and price region")
+    return gaps
+
+
+def watch_item(item):
+    """A fresh WatchItem for one configured item."""
+    return WatchItem(item.name, item.coords, item.region, item.threshold, item.priority, item.fields)
+
+
+class ConfigWatcher:
+    """Notices when config.json is saved again, for reloading it between cycles."""
+
+    def __init__(self, path=CONFIG_FILE, interval=RELOAD_INTERVAL):
+        self.path = path
+        self.interval = interval
+        self.mtime = self._mtime()
+        self.checked = time.monotonic()
+
+    def _mtime(self):
+        try:
+            return os.stat(self.path).st_mtime_ns
+        except OSError:
+            return None
+
+    def poll(self):
+        """The new Config if the file changed since the last poll, else None. Raises ConfigError."""
+        now = time.monotonic()
+        if now - self.checked < self.interval:
+            return None
+        self.checked = now
+        mtime = self._mtime()
+        if mtime == self.mtime:
+            return None
+        self.mtime = mtime
+        return parse(read_config(self.path))
+
+
+def save_config(coords, region, threshold, path=CONFIG_FILE):
+    """Save the buttons and the first watchlist item, keeping buttons configured for other modes."""
+    data = read_config(path)
+    buttons = data.setdefault("BUTTONS", {})
+    for name, (x, y) in coords.items():
+        if name != "item":
+            buttons[name] = [x, y]
+    watchlist = data.setdefault("WATCHLIST", [])
+    if not watchlist:
+        watchlist.append({"NAME": DEFAULT_ITEM, "PRIORITY": 1})
+    x, y = coords["item"]
+    watchlist[0].update({"ITEM": [x, y], "REGION": region, "THRESHOLD_VALUE": threshold})
+    write_config(data, path)
+
+
+def save_watch_item(name, coords, region, threshold, priority, path=CONFIG_FILE):
+    """Add an item to the WATCHLIST, replacing any item of the same name."""
+    data = read_config(path)
+    x, y = coords
+    entry = {"NAME": name, "ITEM": [x, y], "REGION": region, "THRESHOLD_VALUE": threshold, "PRIORITY": priority}
+    data["WATCHLIST"] = [e for e in data.get("WATCHLIST", []) if e.get("NAME") != name] + [entry]
+    write_config(data, path)
+
+
+def save_preprocess(options, path=CONFIG_FILE):
+    """Store the preprocessing options (scale, interpolation, method) chosen by calibration."""
+    data = read_config(path)
+    scale, interpolation, method = options
+    data["PREPROCESS"] = {"SCALE": scale, "INTERPOLATION": interpolation, "METHOD": method}
+    write_config(data, path)
+
+
+def get_mouse_position(prompt, mouse):
+    """Prompt user to capture mouse position."""
+    print(prompt)
+    input("Press Enter when ready...")
+    x, y = mouse.position()
+    print(f"Captured: ({x}, {y})\n")
+    return x, y
+
+
+def configure(button_prompts, mouse, path=CONFIG_FILE):
+    """Capture the given buttons ({name: label}), the price region and the threshold."""
+    coords = {}
+    for name, label in button_prompts.items():
+        print(f"\n--- Configure {label} Coordinate ---")
+        coords[name] = get_mouse_position(f"Move your mouse to the {label} and press Enter.", mouse)
+
+    region = get_region(mouse)
+    threshold = int(input("\nEnter threshold value (e.g., 19000): ").strip())
+    save_config(coords, region, threshold, path)
+
+
+def get_region(mouse, label="price"):
+    """Capture a screen region from its two corners."""
+    print(f"\n--- Configure {label.capitalize()} Region ---")
+    left, top = get_mouse_position(f"Move your mouse to the TOP-LEFT corner of the {label} region.", mouse)
+    right, bottom = get_mouse_position(f"Move your mouse to the BOTTOM-RIGHT corner of the {label} region.", mouse)
+    return {
+        "top": top,
+        "left": left,
+        "width": right - left,
+        "height": bottom - top
+    }
+
+
+def configure_item(name, mouse, path=CONFIG_FILE):
+    """Capture one more watchlist item: its slot, price region, threshold and priority."""
+    print(f"\n--- Configure ITEM slot for {name} ---")
+    coords = get_mouse_position(f"Move your mouse to the ITEM slot for {name} and press Enter.", mouse)
+    region = get_region(mouse)
+    threshold = int(input("\nEnter threshold value (e.g., 19000): ").strip())
+    priority = float(input("Enter priority (1 = normal, higher is checked more often): ").strip() or 1)
+    save_watch_item(name, coords, region, threshold, priority, path)
+
+
+def configure_outcome(outcome, capture, mouse, path=CONFIG_FILE):
+    """Capture the reference image of a purchase outcome (success/failure) dialog."""
+    from market.outcome import save_reference
+    data = read_config(path)
+    if not data.get("RESULT_REGION"):
+        print("Pick a small part of the result dialog that differs between success and failure.")
+        data["RESULT_REGION"] = get_region(mouse, "result")
+    buttons = data.setdefault("BUTTONS", {})
+    if "dismiss" not in buttons and input("Does the dialog need a click to close? [y/N] ").strip().lower() == "y":
+        buttons["dismiss"] = list(get_mouse_position(
+            "Move your mouse to the button that closes the dialog and press Enter.", mouse))
+    write_config(data, path)
+
+    input(f"\nBuy something so the {outcome} dialog shows, then press Enter...")
+    print(f"✅ Saved {save_reference(capture, data['RESULT_REGION'], outcome)}")
@@ -0,0 +1,87 @@
+import threading
+import time
+from contextlib import contextmanager
+
+
+class Control:
+    """Pause, resume and stop for a running bot, safe to call from any thread.
+
+    Everything is an Event, so nothing polls: the actor blocks in proceed()
+    while paused, idle sleeps wake the moment pause or stop is requested,
+    and waits inside a cycle take interrupt to end early on stop. Inside
+    atomic() interrupt is None, so a purchase that has started clicks
+    through to the result dialog before the bot acts on a stop.
+    """
+
+    def __init__(self):
+        self.stopped = threading.Event()
+        self.resumed = threading.Event()
+        self.resumed.set()
+        # Set by stop and pause, cleared by resume: ends idle sleeps early.
+        self.woken = threading.Event()
+        self.stop_requested = None
+        self.listeners = []
+        self.depth = 0
+
+    @property
+    def running(self):
+        return not self.stopped.is_set()
+
+    @property
+    def paused(self):
+        return not self.resumed.is_set()
+
+    @property
+    def interrupt(self):
+        """Event that cuts a wait short on stop, or None inside atomic()."""
+        return None if self.depth else self.stopped
+
+    def on_stop(self, callback):
+        """Call callback (from the stopping thread) when stop() is first requested."""
+        self.listeners.append(callback)
+
+    def stop(self):
+        if self.stopped.is_set():
+            return
+        self.stop_requested = time.perf_counter()
+        self.stopped.set()
+        self.woken.set()
+        self.resumed.set()
+        for callback in self.listeners:
+            callback()
+
+    def pause(self):
+        if self.running:
+            self.resumed.clear()
+            self.woken.set()
+
+    def resume(self):
+        if self.running:
+            self.woken.clear()
+            self.resumed.set()
+
+    def toggle(self):
+        """Pause if running, resume if paused. Returns True if now paused."""
+        if self.paused:
+            self.resume()
+        else:
+            self.pause()
+        return self.paused
+
+    def proceed(self):
+        """Block while paused. Returns False once stopped."""
+        self.resumed.wait()
+        return self.running
+
+    def sleep(self, seconds):
+        """Sleep, waking early on pause or stop. Returns False if woken early."""
+        return not self.woken.wait(seconds)
+
+    @contextmanager
+    def atomic(self):
+        """A sequence that must run to completion once started; waits inside ignore stop."""
+        self.depth += 1
+        try:
+            yield
+        finally:
+            self.depth -= 1
@@ -0,0 +1,257 @@
+import os
+import threading
+import time
+from collections import OrderedDict
+import cv2
+import numpy as np
+
+from market.frame_cache import FrameCache
+from market.ocr import recognize_digits
+from market.preprocess import Preprocessor
+from market.timing import NO_TIMING
+
+TEMPLATE_FILE = "digit_templates.npz"
+
+# Every glyph is scaled to this size before matching.
+GLYPH_W, GLYPH_H = 12, 20
+
+# Components shorter than this fraction of the tallest one are commas/dots.
+SEPARATOR_RATIO = 0.6
+
+# Stop learning a digit once it has this many samples.
+MAX_SAMPLES = 5
+
+# EasyOCR reads only become templates when at least this confident, and only
+# once the same text has been read this many times: a single misread would
+# otherwise be matched confidently from then on and never re-checked.
+LEARN_CONFIDENCE = 0.9
+LEARN_READS = 2
+
+# Distinct EasyOCR texts remembered while waiting for a repeat read.
+MAX_SIGHTINGS = 64
+
+# Components this many glyph widths wide are touching digits and get split.
+SPLIT_RATIO = 1.5
+
+# EasyOCR is not safe to call from several recognizer threads at once.
+_ocr_lock = threading.Lock()
+
+
+class DigitRecognizer:
+    """Template-matching reader for the digits of the game's price font."""
+
+    def __init__(self, path=TEMPLATE_FILE, min_confidence=0.85):
+        self.path = path
+        self.min_confidence = min_confidence
+        self.templates = np.empty((0, GLYPH_W * GLYPH_H), np.float32)
+        self.labels = np.empty(0, np.uint8)
+        self.aspect = None  # typical glyph width / height, learned with the templates
+        self.sightings = OrderedDict()
+        self.lock = threading.Lock()
+        if path and os.path.exists(path):
+            data = np.load(path)
+            self.templates = data["templates"].astype(np.float32)
+            self.labels = data["labels"].astype(np.uint8)
+            if "aspect" in data:
+                self.aspect = float(data["aspect"]) or None
+
+    def known_digits(self):
+        """Return the set of digits that have at least one template."""
+        return set(int(d) for d in self.labels)
+
+    def segment(self, binary):
+        """Split a binarized image into normalized digit glyphs, left to right."""
+        foreground, boxes = self._boxes(binary)
+        glyphs = np.empty((len(boxes), GLYPH_W * GLYPH_H), np.float32)
+        for i, (x, y, w, h) in enumerate(boxes):
+            crop = foreground[y:y + h, x:x + w]
+            glyphs[i] = cv2.resize(crop, (GLYPH_W, GLYPH_H), interpolation=cv2.INTER_AREA).ravel()
+        return _normalize(glyphs)
+
+    def _boxes(self, binary):
+        """Digit bounding boxes (x, y, w, h), left to right, commas dropped."""
+        # Text is whichever colour covers less of the region.
+        if cv2.countNonZero(binary) > binary.size // 2:
+            binary = cv2.bitwise_not(binary)
+
+        count, _, stats, _ = cv2.connectedComponentsWithStats(binary, connectivity=8)
+        boxes = stats[1:]
+        boxes = boxes[boxes[:, cv2.CC_STAT_AREA] > 2]
+        if len(boxes) == 0:
+            return binary, []
+
+        tallest = boxes[:, cv2.CC_STAT_HEIGHT].max()
+        boxes = boxes[boxes[:, cv2.CC_STAT_HEIGHT] >= tallest * SEPARATOR_RATIO]
+        boxes = boxes[np.argsort(boxes[:, cv2.CC_STAT_LEFT])]
+
+        result = []
+        for x, y, w, h, _ in boxes:
+            parts = 1
+            if self.aspect:
+                parts = int(round(w / (self.aspect * h)))
+            if parts >= 2 and w >= SPLIT_RATIO * self.aspect * h:
+                step = w / parts
+                result += [(x + int(i * step), y, int((i + 1) * step) - int(i * step), h) for i in range(parts)]
+            else:
+                result.append((x, y, w, h))
+        return binary, result
+
+    def read(self, binary):
+        """Return (number, confidence) for a binarized price image."""
+        with self.lock:
+            templates, labels = self.templates, self.labels
+        if len(templates) == 0:
+            return None, 0.0
+        glyphs = self.segment(binary)
+        if len(glyphs) == 0:
+            return None, 0.0
+
+        scores = glyphs @ templates.T
+        best = scores.argmax(axis=1)
+        confidence = float(scores[np.arange(len(glyphs)), best].min())
+        digits = labels[best]
+        number = int("".join(str(d) for d in digits))
+        return number, confidence
+
+    def sighted(self, text):
+        """Count one more confident EasyOCR read of text. Returns how many there have been."""
+        with self.lock:
+            count = self.sightings.pop(text, 0) + 1
+            self.sightings[text] = count
+            if len(self.sightings) > MAX_SIGHTINGS:
+                self.sightings.popitem(last=False)
+            return count
+
+    def learn(self, binary, text):
+        """Add glyph samples from a frame whose digits are known. Returns True if templates changed."""
+        _, boxes = self._boxes(binary)
+        glyphs = self.segment(binary)
+        if len(glyphs) != len(text):
+            return False
+
+        with self.lock:
+            aspect = float(np.median([w / h for _, _, w, h in boxes]))
+            self.aspect = aspect if self.aspect is None else 0.8 * self.aspect + 0.2 * aspect
+            templates, labels = self.templates, self.labels
+            counts = np.bincount(labels, minlength=10)
+            for glyph, char in zip(glyphs, text):
+                digit = int(char)
+                if counts[digit] >= MAX_SAMPLES:
+                    continue
+                templates = np.vstack([templates, glyph[None, :]])
+                labels = np.append(labels, np.uint8(digit))
+                counts[digit] += 1
+            changed = len(labels) != len(self.labels)
+            self.templates, self.labels = templates, labels
+        return changed
+
+    def save(self):
+        """Persist the templates so the next run starts calibrated."""
+        if self.path:
+            with self.lock:
+                np.savez(self.path, templates=self.templates, labels=self.labels, aspect=self.aspect or 0.0)
+
+
+def _normalize(vectors):
+    """Zero-mean, unit-length rows so a dot product is a correlation score."""
+    vectors = vectors - vectors.mean(axis=1, keepdims=True)
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return vectors / norms
+
+
+def read_price(binary, recognizer, reader):
+    """Read the price text from a binarized region, falling back to EasyOCR when unsure.
+
+    Returns (text, confidence); text is None when nothing could be read.
+    """
+    return read_prices([binary], recognizer, reader)[0]
+
+
+def read_prices(binaries, recognizer, reader):
+    """read_price over several binarized regions, with one EasyOCR call for all the unsure ones.
+
+    The binaries must be separate arrays, not one reused buffer.
+    """
+    results = []
+    unsure = []
+    for i, binary in enumerate(binaries):
+        number, confidence = recognizer.read(binary)
+        if number is not None and confidence >= recognizer.min_confidence:
+            results.append((str(number), confidence))
+        else:
+            results.append((None, confidence))
+            unsure.append(i)
+    if reader is None or not unsure:
+        return results
+
+    with _ocr_lock:
+        found = recognize_digits(reader, [binaries[i] for i in unsure])
+    changed = False
+    for i, (text, confidence) in zip(unsure, found):
+        digits = text.replace(",", "")
+        if not digits:
+            results[i] = (None, confidence)
+            continue
+        results[i] = (text, confidence)
+        # Calibrate from frames EasyOCR read confidently, and more than once, so the next one takes the fast path.
+        if confidence >= LEARN_CONFIDENCE and recognizer.sighted(digits) >= LEARN_READS:
+            changed = recognizer.learn(binaries[i], digits) or changed
+    if changed:
+        recognizer.save()
+    return results
+
+
+class PriceDecoder:
+    """Turns a BGRA capture of the price region into (OCR text, confidence)."""
+
+    def __init__(self, recognizer, reader=None, frame_cache=None, preprocessor=None, timings=NO_TIMING):
+        self.recognizer = recognizer
+        self.reader = reader
+        self.frame_cache = frame_cache or FrameCache()
+        self.preprocessor = preprocessor or Preprocessor(timings=timings)
+        self.timings = timings
+
+    def __call__(self, screenshot):
+        gray = self.preprocessor.gray(screenshot)
+        binary = self.preprocess(gray)
+
+        # Unchanged listing: reuse the last decode instead of running OCR again.
+        frame_key = self.frame_cache.key(binary)
+        hit, result = self.frame_cache.lookup(frame_key)
+        if not hit:
+            start = time.perf_counter()
+            result = read_price(binary, self.recognizer, self.reader)
+            self.timings.since("ocr", start)
+            self.frame_cache.store(frame_key, result)
+        return result
+
+    def read_all(self, screenshots):
+        """(text, confidence) of several captures (a frame's price and fields) with one OCR pass.
+
+        Cached frames are answered from the cache; the rest share one
+        read_prices call, so EasyOCR runs at most once for all of them.
+        """
+        results = [None] * len(screenshots)
+        pending = []
+        for i, screenshot in enumerate(screenshots):
+            binary = self.preprocess(self.preprocessor.gray(screenshot))
+            frame_key = self.frame_cache.key(binary)
+            hit, result = self.frame_cache.lookup(frame_key)
+            if hit:
+                results[i] = result
+            else:
+                # The preprocessor's buffer is reused for the next capture of the same size.
+                pending.append((i, frame_key, binary.copy()))
+        if pending:
+            start = time.perf_counter()
+            read = read_prices([binary for _, _, binary in pending], self.recognizer, self.reader)
+            self.timings.since("ocr", start)
+            for (i, frame_key, _), result in zip(pending, read):
+                self.frame_cache.store(frame_key, result)
+                results[i] = result
+        return results
+
+    def preprocess(self, gray):
+        """Upscale and binarize a grayscale capture for recognition (valid until this thread's next frame)."""
+        return self.preprocessor.binarize(gray)
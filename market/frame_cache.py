@@ -0,0 +1,54 @@
+import hashlib
+import threading
+from collections import OrderedDict
+
+
+class FrameCache:
+    """Remembers the (text, confidence) decoded from recently seen price frames.
+
+    Frames are keyed by the binarized image recognition actually reads, so
+    two frames share an entry only if the recognizer would see the same
+    pixels, whatever threshold method the preprocessor uses.
+    """
+
+    def __init__(self, max_entries=64):
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()
+
+    def key(self, binary):
+        """Checksum of a binarized region, as handed to recognition."""
+        digest = hashlib.blake2b(binary.tobytes(), digest_size=16)
+        digest.update(repr(binary.shape).encode())
+        return digest.digest()
+
+    def lookup(self, key):
+        """Return (hit, result) for a frame key."""
+        with self.lock:
+            if key in self.entries:
+                self.entries.move_to_end(key)
+                self.hits += 1
+                return True, self.entries[key]
+            self.misses += 1
+            return False, None
+
+    def store(self, key, result):
+        """Remember the result decoded for a frame key."""
+        with self.lock:
+            self.entries[key] = result
+            self.entries.move_to_end(key)
+            if len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+
+    def clear(self):
+        """Forget every entry, e.g. once frames are binarized differently."""
+        with self.lock:
+            self.entries.clear()
+
+    def summary(self):
+        """One-line hit/miss report."""
+        total = self.hits + self.misses
+        rate = 100.0 * self.hits / total if total else 0.0
+        return f"{self.hits} hits / {self.misses} misses ({rate:.0f}% hit rate)"
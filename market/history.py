@@ -0,0 +1,160 @@
+"""Append-only price history and the tool to query it.
+
+    python -m market --history prices.bin          # record while the bot runs
+    python -m market.history prices.bin --window 50
+
+Every price the bot reads becomes one fixed-width RECORD appended to the
+file, so reading it back is a single np.memmap with no parsing. Writes happen
+on a background thread; the bot only puts a tuple on a queue.
+"""
+import argparse
+import queue
+import sys
+import threading
+import time
+
+import numpy as np
+
+ITEM_BYTES = 16
+RECORD = np.dtype([
+    ("time", "<f8"),             # wall-clock seconds
+    ("item", f"S{ITEM_BYTES}"),  # watchlist name, utf-8, truncated
+    ("price", "<i8"),
+    ("confidence", "<f4"),
+    ("action", "u1"),            # index into ACTIONS
+])
+# Buys are followed by a second record with the outcome seen on screen (confidence = match score).
+ACTIONS = ("skip", "buy", "success", "failure", "unknown")
+# Actions up to this one are price reads; the rest are purchase outcomes.
+LAST_READ = ACTIONS.index("buy")
+
+
+def item_key(name):
+    """An item name as stored: UTF-8, cut to ITEM_BYTES on a character boundary."""
+    return name.encode()[:ITEM_BYTES].decode(errors="ignore").encode()
+
+
+def item_name(key):
+    """The stored item name as text; files from before item_key may end in half a character."""
+    return key.decode(errors="replace")
+
+
+class HistoryWriter:
+    """Appends price records to a file from a background thread."""
+
+    def __init__(self, path):
+        self.path = path
+        self.queue = queue.SimpleQueue()
+        self.written = 0
+        self.thread = threading.Thread(target=self._run, name="history", daemon=True)
+        self.thread.start()
+
+    def record(self, item, price, confidence, action):
+        """Queue one observation; never blocks on disk."""
+        self.queue.put((time.time(), item_key(item), price, confidence, ACTIONS.index(action)))
+
+    def close(self):
+        """Write everything queued so far and stop the writer."""
+        self.queue.put(None)
+        self.thread.join()
+
+    def _run(self):
+        with open(self.path, "ab") as f:
+            while True:
+                rows = [self.queue.get()]
+                # Batch whatever piled up while the last write was in flight.
+                while not self.queue.empty():
+                    rows.append(self.queue.get())
+                done = rows[-1] is None
+                rows = [row for row in rows if row is not None]
+                if rows:
+                    f.write(np.array(rows, RECORD).tobytes())
+                    f.flush()
+                    self.written += len(rows)
+                if done:
+                    return
+
+
+def load(path):
+    """Memory-map a history file as a RECORD array (a partly written last record is ignored)."""
+    with open(path, "rb") as f:
+        count = f.seek(0, 2) // RECORD.itemsize
+    if count == 0:
+        return np.empty(0, RECORD)
+    return np.memmap(path, RECORD, mode="r", shape=(count,))
+
+
+def price_reads(records):
+    """The records that are price reads, without the outcome records that follow buys."""
+    return records[records["action"] <= LAST_READ]
+
+
+def rolling(values, window, func):
+    """func (np.min, np.median, ...) over each trailing window of values."""
+    if len(values) < window:
+        return np.empty(0, values.dtype)
+    return func(np.lib.stride_tricks.sliding_window_view(values, window), axis=1)
+
+
+def change_intervals(records):
+    """Seconds between consecutive price changes of one item's records."""
+    changed = np.flatnonzero(np.diff(records["price"]) != 0) + 1
+    return np.diff(records["time"][changed])
+
+
+def summarize(records, window):
+    """Per-item summary lines: last price, rolling min/median, how often the price changes, buy outcomes."""
+    lines = []
+    for item in np.unique(records["item"]):
+        rows = records[records["item"] == item]
+        reads = price_reads(rows)
+        actions = np.bincount(rows["action"], minlength=len(ACTIONS))
+        line = f"{item_name(item):<16} {len(reads):>7} reads, {actions[ACTIONS.index('buy')]} buys"
+        if len(reads):
+            prices = reads["price"]
+            window_prices = prices[-window:]
+            line += (f" | last {prices[-1]}, min {window_prices.min()}, median {np.median(window_prices):.0f} "
+                     f"(last {len(window_prices)})")
+            intervals = change_intervals(reads)
+            if len(intervals):
+                line += f" | changes every {np.median(intervals):.1f}s (median)"
+        if actions[LAST_READ + 1:].any():
+            line += " | " + ", ".join(f"{actions[i]} {ACTIONS[i]}" for i in range(LAST_READ + 1, len(ACTIONS)))
+        lines.append(line)
+    return lines
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Summarize a price history file.")
+    parser.add_argument("path")
+    parser.add_argument("--item", help="only this watchlist item")
+    parser.add_argument("--window", type=int, default=50, help="reads in the rolling min/median")
+    parser.add_argument("--series", action="store_true",
+                        help="print the rolling min/median for every read (use with --item)")
+    args = parser.parse_args(argv)
+
+    records = load(args.path)
+    if args.item:
+        records = records[records["item"] == item_key(args.item)]
+    if len(records) == 0:
+        print("No records.")
+        return 1
+
+    for line in summarize(records, args.window):
+        print(line)
+    if args.series:
+        records = price_reads(records)
+        prices = records["price"]
+        lows, medians = rolling(prices, args.window, np.min), rolling(prices, args.window, np.median)
+        offset = len(prices) - len(lows)
+        print(f"\n{'time':<20} {'item':<16} {'price':>9} {'min':>9} {'median':>9}")
+        for i in range(offset, len(prices)):
+            row = records[i]
+            stamp = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(row["time"]))
+            print(f"{stamp:<20} {item_name(row['item']):<16} {row['price']:>9} "
+                  f"{lows[i - offset]:>9} {medians[i - offset]:>9.0f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,55 @@
+"""Declarative click sequences for each bot mode.
+
+Every cycle runs `before`, opens the item and reads the price, then runs
+`buy` if the price is at or below the threshold (otherwise clicks return).
+A step clicks `button`, then waits for the area around the `watch` button
+to change (or skips the wait when watch is None).
+"""
+from collections import namedtuple
+
+Step = namedtuple("Step", "button watch message")
+Mode = namedtuple("Mode", "name description before buy scan_interval")
+
+FOLLOW = Step("follow", "item", "🟨 Clicked follow at ({x}, {y})")
+
+MODES = {
+    "v3": Mode(
+        "v3", "Item only. Faster than v4; only works for items that are available.",
+        before=(),
+        buy=(Step("purchase", None, "🛒 Clicked purchase at ({x}, {y})"),),
+        scan_interval=0.75,
+    ),
+    "v4": Mode(
+        "v4", "Follow + item. Slower than v3; works for items that are not available.",
+        before=(FOLLOW,),
+        buy=(Step("purchase", None, "🛒 Clicked purchase at ({x}, {y})"),),
+        scan_interval=0.75,
+    ),
+    "v5": Mode(
+        "v5", "Follow + item + max + purchase + confirm.",
+        before=(FOLLOW,),
+        buy=(
+            Step("max", "purchase", "⬆️ Clicked max item at ({x}, {y})"),
+            Step("purchase", "confirm", "🛒 Clicked purchase at ({x}, {y})"),
+            Step("confirm", None, "✅ Confirmed purchase at ({x}, {y})"),
+        ),
+        scan_interval=0.2,
+    ),
+}
+
+# Prompt order when configuring; item and return are used by every mode.
+BUTTON_PROMPTS = {
+    "follow": "FOLLOW button",
+    "item": "ITEM slot",
+    "return": "RETURN button",
+    "max": "MAX ITEM button",
+    "purchase": "PURCHASE button",
+    "confirm": "CONFIRM button",
+}
+
+
+def buttons(mode):
+    """Every button a mode clicks, in prompt order."""
+    used = {"item", "return"}
+    used.update(step.button for step in mode.before + mode.buy)
+    return [name for name in BUTTON_PROMPTS if name in used]
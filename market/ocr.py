@@ -0,0 +1,108 @@
+import threading
+
+WARMUP_TEXT = "19,000"
+DIGIT_ALLOWLIST = "0123456789,"
+
+# Padding around the text box, and blank rows between stacked crops.
+BOX_PADDING = 4
+STACK_GAP = 8
+
+
+def text_box(binary):
+    """Padded bounding box of the text in a binarized image, as (x0, x1, y0, y1), or None."""
+    import cv2
+    foreground = binary
+    # Text is whichever colour covers less of the region.
+    if cv2.countNonZero(binary) > binary.size // 2:
+        foreground = cv2.bitwise_not(binary)
+    points = cv2.findNonZero(foreground)
+    if points is None:
+        return None
+    x, y, w, h = cv2.boundingRect(points)
+    height, width = binary.shape
+    return (max(x - BOX_PADDING, 0), min(x + w + BOX_PADDING, width),
+            max(y - BOX_PADDING, 0), min(y + h + BOX_PADDING, height))
+
+
+def recognize_digits(reader, binaries):
+    """Digits-only EasyOCR over several binarized crops in one recognition call.
+
+    Skips CRAFT text detection by handing EasyOCR the text boxes directly: the
+    crops are stacked into one image, one box each. Returns a (text,
+    confidence) pair per crop, ("", 0.0) where nothing was read.
+    """
+    import numpy as np
+    results = [("", 0.0)] * len(binaries)
+    boxes = [(i, box) for i, b in enumerate(binaries) if (box := text_box(b)) is not None]
+    if not boxes:
+        return results
+
+    width = max(binaries[i].shape[1] for i, _ in boxes)
+    height = sum(binaries[i].shape[0] + STACK_GAP for i, _ in boxes)
+    canvas = np.full((height, width), 255, np.uint8)
+    horizontal_list = []
+    rows = []
+    top = 0
+    for i, (x0, x1, y0, y1) in boxes:
+        crop = binaries[i]
+        # EasyOCR reads dark text on white; flip crops that are the other way round.
+        if crop[y0:y1, x0:x1].mean() < 128:
+            crop = 255 - crop
+        canvas[top:top + crop.shape[0], :crop.shape[1]] = crop
+        horizontal_list.append([x0, x1, top + y0, top + y1])
+        rows.append((top, top + crop.shape[0], i))
+        top += crop.shape[0] + STACK_GAP
+
+    found = reader.recognize(canvas, horizontal_list=horizontal_list, free_list=[],
+                             allowlist=DIGIT_ALLOWLIST, batch_size=len(horizontal_list), detail=1)
+    # Results come back sorted by position; map each one to its crop by row.
+    for box, text, confidence in found:
+        y = (box[0][1] + box[2][1]) / 2
+        for row_top, row_bottom, i in rows:
+            if row_top <= y < row_bottom:
+                results[i] = (text.strip(), float(confidence))
+                break
+    return results
+
+
+def warmup(reader):
+    """Run one throwaway read so model setup is not paid by the first real price."""
+    import cv2
+    import numpy as np
+    image = np.full((60, 200), 255, np.uint8)
+    cv2.putText(image, WARMUP_TEXT, (10, 45), cv2.FONT_HERSHEY_SIMPLEX, 1.2, 0, 2)
+    reader.readtext(image, detail=0)
+
+
+class LazyReader:
+    """EasyOCR reader that only imports easyocr (and torch) the first time it is used.
+
+    Once the digit templates are calibrated most runs never need it, so
+    startup does not pay for loading the model.
+    """
+
+    def __init__(self, languages=("en",), gpu=False):
+        self.languages = list(languages)
+        self.gpu = gpu
+        self.reader = None
+        self.lock = threading.Lock()
+
+    def load(self):
+        """Import easyocr and build the reader now."""
+        with self.lock:
+            if self.reader is None:
+                import easyocr
+                self.reader = easyocr.Reader(self.languages, gpu=self.gpu)
+        return self.reader
+
+    def warmup(self):
+        """Load and warm the model on a background thread; returns the thread."""
+        thread = threading.Thread(target=lambda: warmup(self.load()), name="ocr-warmup", daemon=True)
+        thread.start()
+        return thread
+
+    def readtext(self, image, **kwargs):
+        return (self.reader or self.load()).readtext(image, **kwargs)
+
+    def recognize(self, image, **kwargs):
+        return (self.reader or self.load()).recognize(image, **kwargs)
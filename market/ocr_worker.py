@@ -0,0 +1,161 @@
+"""Long-lived OCR worker that keeps a warmed EasyOCR model in memory.
+
+    python -m market.ocr_worker            # leave running in its own terminal
+    python -m market --mode v5             # connects to it automatically
+
+Bots connect over a local multiprocessing connection (works on Windows and
+Linux), so restarting a bot after a config change skips the model load.
+
+The connection unpickles what it receives, so it only listens on loopback
+and both sides authenticate with a random key the worker creates on first
+start, in a file in the user's home directory that only they can read.
+"""
+import argparse
+import ipaddress
+import os
+import secrets
+import threading
+import time
+from multiprocessing import AuthenticationError
+from multiprocessing.connection import Client, Listener
+
+from market.ocr import LazyReader, warmup
+
+ADDRESS = ("127.0.0.1", 47361)
+KEY_FILE = os.path.join(os.path.expanduser("~"), ".market-ocr-key")
+KEY_BYTES = 32
+
+# Reader methods a client may call.
+METHODS = ("readtext", "recognize")
+
+
+def is_loopback(host):
+    if host == "localhost":
+        return True
+    try:
+        return ipaddress.ip_address(host).is_loopback
+    except ValueError:
+        return False
+
+
+def parse_address(text):
+    """'host:port' -> (host, port); the host must be a loopback address."""
+    host, _, port = text.rpartition(":")
+    host = host or ADDRESS[0]
+    if not is_loopback(host):
+        raise argparse.ArgumentTypeError(f"{host} is not a loopback address; the worker only serves this machine")
+    try:
+        return host, int(port)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid port in {text!r}") from None
+
+
+def load_authkey(create=False, path=KEY_FILE):
+    """This user's key for worker connections; None if there is none yet and create is False."""
+    try:
+        with open(path, "rb") as f:
+            return f.read()
+    except FileNotFoundError:
+        if not create:
+            return None
+    try:
+        # Owner read/write only; on Windows the home directory's ACL keeps other users out.
+        fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+    except FileExistsError:
+        return load_authkey(path=path)
+    key = secrets.token_bytes(KEY_BYTES)
+    with os.fdopen(fd, "wb") as f:
+        f.write(key)
+    return key
+
+
+class RemoteReader:
+    """Drop-in for easyocr.Reader that forwards calls to a running worker."""
+
+    def __init__(self, address=ADDRESS, authkey=None):
+        self.conn = Client(address, authkey=authkey or load_authkey())
+        self.lock = threading.Lock()
+
+    @classmethod
+    def connect(cls, address=ADDRESS):
+        """Return a reader for the worker at address, or None if none is running or it rejects our key."""
+        authkey = load_authkey()
+        if authkey is None:
+            return None
+        try:
+            return cls(address, authkey)
+        except (OSError, AuthenticationError):
+            return None
+
+    def call(self, method, *args, **kwargs):
+        """Run a reader method in the worker and return its result."""
+        with self.lock:
+            self.conn.send((method, args, kwargs))
+            status, result = self.conn.recv()
+        if status != "ok":
+            raise RuntimeError(f"OCR worker failed: {result}")
+        return result
+
+    def readtext(self, image, **kwargs):
+        return self.call("readtext", image, **kwargs)
+
+    def recognize(self, image, **kwargs):
+        return self.call("recognize", image, **kwargs)
+
+    def close(self):
+        self.conn.close()
+
+
+def serve(address=ADDRESS, gpu=False):
+    """Load and warm the model, then answer clients until interrupted."""
+    if not is_loopback(address[0]):
+        raise ValueError(f"{address[0]} is not a loopback address")
+    authkey = load_authkey(create=True)
+    start = time.perf_counter()
+    reader = LazyReader(gpu=gpu).load()
+    warmup(reader)
+    print(f"✅ OCR model ready in {time.perf_counter() - start:.1f}s, listening on {address[0]}:{address[1]}")
+
+    # One model, one inference at a time; connections just queue up.
+    lock = threading.Lock()
+    with Listener(address, authkey=authkey) as listener:
+        while True:
+            try:
+                conn = listener.accept()
+            except (AuthenticationError, EOFError, ConnectionError):
+                # Wrong key, or a client that hung up mid-handshake.
+                continue
+            threading.Thread(target=_handle, args=(conn, reader, lock), daemon=True).start()
+
+
+def _handle(conn, reader, lock):
+    with conn:
+        while True:
+            try:
+                method, args, kwargs = conn.recv()
+            except (EOFError, OSError):
+                return
+            if method not in METHODS:
+                conn.send(("error", f"unknown method {method!r}"))
+                continue
+            try:
+                with lock:
+                    result = getattr(reader, method)(*args, **kwargs)
+                conn.send(("ok", result))
+            except Exception as e:
+                conn.send(("error", repr(e)))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Keep a warmed EasyOCR model running for the bots.")
+    parser.add_argument("--address", type=parse_address, default=ADDRESS, help="loopback host:port to listen on")
+    parser.add_argument("--gpu", action="store_true")
+    args = parser.parse_args(argv)
+    try:
+        serve(args.address, args.gpu)
+    except KeyboardInterrupt:
+        print("OCR worker stopped.")
+
+
+if __name__ == "__main__":
+    main()
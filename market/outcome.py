@@ -0,0 +1,73 @@
+import os
+import time
+
+import cv2
+
+from market.waits import POLL_INTERVAL
+
+OUTCOMES = ("success", "failure")
+REFERENCE_FILE = "outcome_{}.png"
+
+# Normalized correlation a reference needs to count as on screen.
+MATCH_SCORE = 0.8
+
+
+def reference_path(outcome, directory="."):
+    return os.path.join(directory, REFERENCE_FILE.format(outcome))
+
+
+def save_reference(capture, region, outcome, directory="."):
+    """Store what the result region shows right now as the reference for an outcome."""
+    gray = cv2.cvtColor(capture.grab(region), cv2.COLOR_BGRA2GRAY)
+    path = reference_path(outcome, directory)
+    cv2.imwrite(path, gray)
+    return path
+
+
+class OutcomeChecker:
+    """Tells a successful purchase from a failed one by the dialog it leaves on screen.
+
+    region is a small area of the result dialog; references maps an outcome
+    to a grayscale capture of that area. One grab and a normalized
+    correlation per reference classify a frame in well under a millisecond.
+    """
+
+    def __init__(self, region, references, min_score=MATCH_SCORE):
+        self.region = region
+        self.references = references
+        self.min_score = min_score
+
+    @classmethod
+    def load(cls, region, directory="."):
+        """Checker for the reference images in directory, or None unless every outcome has one.
+
+        With only one reference, any other dialog would look like no dialog
+        at all, so a failure could never be told from a slow screen.
+        """
+        references = {}
+        for outcome in OUTCOMES:
+            path = reference_path(outcome, directory)
+            if os.path.exists(path):
+                references[outcome] = cv2.imread(path, cv2.IMREAD_GRAYSCALE)
+        return cls(region, references) if len(references) == len(OUTCOMES) and region else None
+
+    def classify(self, capture):
+        """(outcome, score) of the best matching reference, outcome None if none matches."""
+        gray = cv2.cvtColor(capture.grab(self.region), cv2.COLOR_BGRA2GRAY)
+        best, best_score = None, 0.0
+        for outcome, reference in self.references.items():
+            if reference.shape != gray.shape:
+                continue
+            score = float(cv2.matchTemplate(gray, reference, cv2.TM_CCOEFF_NORMED)[0, 0])
+            if score > best_score:
+                best, best_score = outcome, score
+        return (best if best_score >= self.min_score else None), best_score
+
+    def wait(self, capture, timeout):
+        """Poll until a reference matches; returns (outcome, score), outcome None on timeout."""
+        deadline = time.perf_counter() + timeout
+        while True:
+            outcome, score = self.classify(capture)
+            if outcome or time.perf_counter() >= deadline:
+                return outcome, score
+            time.sleep(POLL_INTERVAL)
@@ -0,0 +1,191 @@
+import threading
+import time
+from collections import deque, namedtuple
+
+import numpy as np
+
+from market.regions import PRICE
+from market.timing import NO_TIMING
+from market.waits import SETTLE_FRAMES
+
+Frame = namedtuple("Frame", "frame_id captured_at pixels raw stable regions")
+Reading = namedtuple("Reading", "text confidence captured_at raw stable fields")
+
+
+class FrameRing:
+    """Bounded frame buffer that drops the oldest frame when full."""
+
+    def __init__(self, size):
+        self.frames = deque(maxlen=size)
+        self.cond = threading.Condition()
+        self.dropped = 0
+        self.closed = False
+
+    def put(self, frame):
+        """Add a frame, evicting the oldest if the ring is full."""
+        with self.cond:
+            if len(self.frames) == self.frames.maxlen:
+                self.dropped += 1
+            self.frames.append(frame)
+            self.cond.notify()
+
+    def get(self):
+        """Block until a frame is available. Returns None once closed."""
+        with self.cond:
+            while not self.frames and not self.closed:
+                self.cond.wait()
+            if self.closed:
+                return None
+            return self.frames.popleft()
+
+    def clear(self):
+        """Drop all pending frames."""
+        with self.cond:
+            self.frames.clear()
+
+    def close(self):
+        """Wake up and release every waiting consumer."""
+        with self.cond:
+            self.closed = True
+            self.cond.notify_all()
+
+
+class Pipeline:
+    """Captures an item's regions and decodes them on background threads.
+
+    The actor arms the pipeline with the item's RegionSet right before
+    opening it, then blocks in read() until a settled frame has been decoded.
+    decode(pixels) receives a BGRA view of one region and returns the OCR
+    text (or None) and its confidence; the price becomes the reading's text,
+    any other regions go in its fields.
+    """
+
+    def __init__(self, capture, decode, workers=2, ring_size=4, max_age=0.25, capture_interval=0.005,
+                 timings=NO_TIMING):
+        self.capture = capture
+        self.regions = None
+        self.decode = decode
+        # A PriceDecoder reads a frame's price and fields with one OCR pass; other decoders one by one.
+        self.decode_all = getattr(decode, "read_all", None) or (lambda shots: [decode(shot) for shot in shots])
+        self.max_age = max_age
+        self.capture_interval = capture_interval
+        self.timings = timings
+        self.ring = FrameRing(ring_size)
+        self.armed = threading.Event()
+        self.stopped = threading.Event()
+        self.result = threading.Condition()
+        self.latest = None
+        self.latest_id = -1
+        self.armed_at = 0.0
+        self.baseline = None
+        self.stale = 0
+        self.failure = None
+        self.threads = [threading.Thread(target=self._run, args=(self._capture,), name="capture", daemon=True)]
+        self.threads += [threading.Thread(target=self._run, args=(self._recognize,), name=f"recognize-{i}",
+                                          daemon=True)
+                         for i in range(workers)]
+
+    def start(self):
+        """Start the capture thread and recognizer workers."""
+        for thread in self.threads:
+            thread.start()
+
+    def stop(self):
+        """Signal every stage to exit."""
+        self.stopped.set()
+        self.armed.set()
+        self.ring.close()
+        with self.result:
+            self.result.notify_all()
+
+    def arm(self, regions, baseline):
+        """Start capturing a RegionSet; frames identical to baseline (the pre-click view) are ignored."""
+        with self.result:
+            self.latest = None
+            self.armed_at = time.perf_counter()
+        self.regions = regions
+        self.baseline = baseline
+        self.ring.clear()
+        self.armed.set()
+
+    def disarm(self):
+        """Pause capturing until the next arm()."""
+        self.armed.clear()
+
+    def read(self, timeout):
+        """Wait for a decoded, settled frame no older than max_age. Returns None on timeout.
+
+        Raises RuntimeError once a capture or recognizer thread has died, so
+        the bot stops instead of timing out on every read.
+        """
+        deadline = time.perf_counter() + timeout
+        with self.result:
+            while not self.stopped.is_set():
+                if self.failure:
+                    name, error = self.failure
+                    raise RuntimeError(f"{name} thread failed: {error!r}") from error
+                reading = self.latest
+                if reading is not None and reading.stable >= SETTLE_FRAMES:
+                    if time.perf_counter() - reading.captured_at <= self.max_age:
+                        return reading
+                remaining = deadline - time.perf_counter()
+                if remaining <= 0:
+                    if reading is not None:
+                        self.stale += 1
+                    return None
+                self.result.wait(remaining)
+        return None
+
+    def _run(self, stage):
+        """Run a stage; if it raises, keep the error for read() to report."""
+        try:
+            stage()
+        except Exception as e:
+            with self.result:
+                self.failure = self.failure or (threading.current_thread().name, e)
+                self.result.notify_all()
+
+    def _capture(self):
+        frame_id = 0
+        previous = None
+        stable = 0
+        while not self.stopped.is_set():
+            if not self.armed.is_set():
+                previous = None
+                self.armed.wait()
+                continue
+
+            regions = self.regions
+            start = time.perf_counter()
+            shot = regions.grab(self.capture)
+            captured_at = time.perf_counter()
+            self.timings.record("capture", captured_at - start)
+            # The grab buffer may be reused; raw is the frame's own (and only) copy.
+            raw = shot.tobytes()
+            if raw != self.baseline:
+                stable = stable + 1 if raw == previous else 0
+                pixels = np.frombuffer(raw, np.uint8).reshape(shot.shape)
+                self.ring.put(Frame(frame_id, captured_at, pixels, raw, stable, regions))
+                frame_id += 1
+            previous = raw
+            self.stopped.wait(self.capture_interval)
+
+    def _recognize(self):
+        while True:
+            frame = self.ring.get()
+            if frame is None:
+                return
+            views = frame.regions.views(frame.pixels)
+            price = views.pop(PRICE)
+            if views:
+                (text, confidence), *rest = self.decode_all([price, *views.values()])
+                fields = {name: result[0] for name, result in zip(views, rest)}
+            else:
+                text, confidence = self.decode(price)
+                fields = {}
+            with self.result:
+                # Workers finish out of order; only ever move forward.
+                if frame.frame_id > self.latest_id and frame.captured_at >= self.armed_at:
+                    self.latest_id = frame.frame_id
+                    self.latest = Reading(text, confidence, frame.captured_at, frame.raw, frame.stable, fields)
+                    self.result.notify_all()
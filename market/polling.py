@@ -0,0 +1,68 @@
+import time
+
+# Weight of the newest gap in the learned time between price changes.
+GAP_SMOOTHING = 0.3
+
+# Each quiet cycle stretches the idle time by this factor.
+GROWTH = 1.5
+
+# First idle step after a change, when min_interval is 0.
+FIRST_STEP = 0.02
+
+
+class AdaptivePoller:
+    """Idle time between cycles, learned from how often prices actually change.
+
+    Right after an item's price changes, its interval drops to min_interval.
+    Every cycle without a change stretches it by GROWTH, up to max_interval
+    and never beyond half the item's learned time between changes, so the
+    next refresh is still caught early. The bot idles for the shortest
+    interval over all items: it only slows down when the whole watchlist is
+    quiet.
+    """
+
+    def __init__(self, min_interval=0.0, max_interval=2.0):
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.intervals = {}
+        self.changed_at = {}
+        self.gaps = {}
+        self.idle = min_interval
+        self.scans = 0
+        self.since = time.perf_counter()
+
+    def update(self, item, price):
+        """Record a cycle's reading of an item and return how long to idle before the next cycle."""
+        now = time.perf_counter()
+        self.scans += 1
+        interval = self.intervals.get(item, self.min_interval)
+        if price is not None and price != item.last_price:
+            if item in self.changed_at:
+                gap = now - self.changed_at[item]
+                learned = self.gaps.get(item)
+                self.gaps[item] = gap if learned is None else (1 - GAP_SMOOTHING) * learned + GAP_SMOOTHING * gap
+            self.changed_at[item] = now
+            interval = self.min_interval
+        else:
+            interval = max(interval * GROWTH, self.min_interval, FIRST_STEP)
+            limit = self.max_interval
+            if item in self.gaps:
+                limit = min(limit, self.gaps[item] / 2)
+            interval = min(interval, max(limit, self.min_interval))
+        self.intervals[item] = interval
+        self.idle = min(self.intervals.values())
+        return self.idle
+
+    def retain(self, items):
+        """Forget items no longer on the watchlist."""
+        for learned in (self.intervals, self.changed_at, self.gaps):
+            for item in [item for item in learned if item not in items]:
+                del learned[item]
+        self.idle = min(self.intervals.values(), default=self.min_interval)
+
+    def summary(self):
+        """One-line effective scan rate since the previous summary."""
+        now = time.perf_counter()
+        rate = self.scans / (now - self.since)
+        self.scans, self.since = 0, now
+        return f"{rate:.1f} scans/s, idle {self.idle * 1000:.0f}ms"
@@ -0,0 +1,182 @@
+"""Grayscale, upscale and binarize price captures into reused buffers.
+
+    python -m market.preprocess --frames captures/   # pick the cheapest accurate options
+    python -m market.preprocess                      # same, on synthetic simulator frames
+
+Calibration reads every sample frame with each candidate option set (digit
+templates only) and saves the fastest one that reads as many frames correctly
+as the best, so the bot only pays for upscaling and cubic interpolation when
+the game's font actually needs them.
+"""
+import argparse
+import sys
+import threading
+import time
+from collections import namedtuple
+
+import cv2
+import numpy as np
+
+from market.timing import NO_TIMING
+
+# scale: upscale factor; interpolation: "nearest", "linear" or "cubic";
+# method: "fixed" (threshold at 150), "otsu" or "adaptive".
+Options = namedtuple("Options", "scale interpolation method")
+
+DEFAULT = Options(2, "cubic", "fixed")
+
+# Roughly cheapest first; calibration keeps the first of the most accurate.
+CANDIDATES = (
+    Options(1, "nearest", "fixed"),
+    Options(1, "nearest", "otsu"),
+    Options(2, "nearest", "fixed"),
+    Options(2, "nearest", "otsu"),
+    Options(2, "linear", "fixed"),
+    Options(2, "linear", "otsu"),
+    DEFAULT,
+    Options(2, "cubic", "otsu"),
+    Options(2, "cubic", "adaptive"),
+)
+
+INTERPOLATION = {"nearest": cv2.INTER_NEAREST, "linear": cv2.INTER_LINEAR, "cubic": cv2.INTER_CUBIC}
+
+FIXED_THRESHOLD = 150
+
+# Adaptive: neighbourhood of 15 pixels per upscale step; text must be this much brighter than it.
+ADAPTIVE_BLOCK = 15
+ADAPTIVE_OFFSET = -10
+
+
+class Preprocessor:
+    """Turns BGRA captures into binarized images without allocating per frame.
+
+    Buffers are sized from the first frame of each capture size and reused
+    through OpenCV's dst= arguments. Recognizer threads each get their own
+    set, so the result is only valid until the same thread's next call.
+    """
+
+    def __init__(self, options=DEFAULT, timings=NO_TIMING):
+        self.options = Options(*options)
+        self.interpolation = INTERPOLATION[self.options.interpolation]
+        self.timings = timings
+        self.local = threading.local()
+
+    def buffers(self, shape):
+        """This thread's (gray, resized, binary) buffers for a (height, width) capture."""
+        cache = getattr(self.local, "buffers", None)
+        if cache is None:
+            cache = self.local.buffers = {}
+        if shape not in cache:
+            height, width = shape
+            scale = self.options.scale
+            gray = np.empty((height, width), np.uint8)
+            resized = np.empty((height * scale, width * scale), np.uint8) if scale != 1 else gray
+            cache[shape] = gray, resized, np.empty_like(resized)
+        return cache[shape]
+
+    def gray(self, screenshot):
+        """Grayscale copy of a BGRA capture, in this thread's buffer."""
+        start = time.perf_counter()
+        gray = cv2.cvtColor(screenshot, cv2.COLOR_BGRA2GRAY, dst=self.buffers(screenshot.shape[:2])[0])
+        self.timings.since("cvtColor", start)
+        return gray
+
+    def binarize(self, gray):
+        """Upscale and binarize a grayscale capture for recognition."""
+        _, resized, binary = self.buffers(gray.shape)
+        start = time.perf_counter()
+        if resized is not gray:
+            cv2.resize(gray, (resized.shape[1], resized.shape[0]), dst=resized, interpolation=self.interpolation)
+        scaled = time.perf_counter()
+        method = self.options.method
+        if method == "otsu":
+            cv2.threshold(resized, 0, 255, cv2.THRESH_BINARY_INV | cv2.THRESH_OTSU, dst=binary)
+        elif method == "adaptive":
+            cv2.adaptiveThreshold(resized, 255, cv2.ADAPTIVE_THRESH_MEAN_C, cv2.THRESH_BINARY,
+                                  ADAPTIVE_BLOCK * self.options.scale | 1, ADAPTIVE_OFFSET, dst=binary)
+        else:
+            cv2.threshold(resized, FIXED_THRESHOLD, 255, cv2.THRESH_BINARY_INV, dst=binary)
+        self.timings.record("resize", scaled - start)
+        self.timings.since("threshold", scaled)
+        return binary
+
+
+def evaluate(options, samples, recognizer, repeat=3):
+    """Returns (frames read correctly, seconds per frame) for one option set.
+
+    samples are (BGRA capture, expected digits) pairs; only the digit
+    templates are used, never EasyOCR.
+    """
+    preprocessor = Preprocessor(options)
+    correct = 0
+    for screenshot, expected in samples:
+        number, confidence = recognizer.read(preprocessor.binarize(preprocessor.gray(screenshot)))
+        correct += number is not None and confidence >= recognizer.min_confidence and str(number) == expected
+
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for screenshot, _ in samples:
+            preprocessor.binarize(preprocessor.gray(screenshot))
+    return correct, (time.perf_counter() - start) / (repeat * len(samples))
+
+
+def calibrate(samples, recognizer, candidates=CANDIDATES):
+    """Pick the fastest candidate that reads as many samples as the best one.
+
+    Returns (options, results) where results maps each candidate to
+    (correct, seconds per frame).
+    """
+    results = {options: evaluate(options, samples, recognizer) for options in candidates}
+    best = max(correct for correct, _ in results.values())
+    accurate = [options for options, (correct, _) in results.items() if correct == best]
+    return min(accurate, key=lambda options: results[options][1]), results
+
+
+def synthetic_samples(count=200, seed=0):
+    """Simulator-rendered price frames, for calibrating without recorded captures."""
+    from market.simulator import REGION, make_feed, render_price
+    samples = []
+    for price in make_feed(count, 19000, cheap_ratio=0.5, seed=seed):
+        text = render_price(price, REGION["width"], REGION["height"])
+        samples.append((cv2.cvtColor(text, cv2.COLOR_GRAY2BGRA), str(price)))
+    return samples
+
+
+def main(argv=None):
+    from market.bench import load_frames
+    from market.config import CONFIG_FILE, save_preprocess
+    from market.digits import TEMPLATE_FILE, DigitRecognizer, PriceDecoder
+
+    parser = argparse.ArgumentParser(description="Choose the cheapest preprocessing that still reads prices.")
+    parser.add_argument("--frames", help="recorded price-region PNGs (<price>[_n].png) or a replay archive")
+    parser.add_argument("--templates", default=TEMPLATE_FILE)
+    parser.add_argument("--config", default=CONFIG_FILE)
+    parser.add_argument("--no-save", action="store_true", help="only print the results")
+    args = parser.parse_args(argv)
+
+    if args.frames:
+        recognizer = DigitRecognizer(args.templates)
+        samples = [(cv2.cvtColor(image, cv2.COLOR_GRAY2BGRA), str(price))
+                   for price, image in load_frames(args.frames)]
+    else:
+        from market.simulator import calibrate as learn_font
+        recognizer = DigitRecognizer(path=None)
+        learn_font(recognizer, PriceDecoder(recognizer))
+        samples = synthetic_samples()
+    if not recognizer.known_digits():
+        print(f"❌ No digit templates in {args.templates}; run the bot once so it can learn the font.")
+        return 1
+
+    chosen, results = calibrate(samples, recognizer)
+    print(f"{'scale':>5} {'interp':<8} {'method':<9} {'correct':>9} {'us/frame':>9}")
+    for options, (correct, seconds) in results.items():
+        mark = "  <-" if options == chosen else ""
+        print(f"{options.scale:>5} {options.interpolation:<8} {options.method:<9} "
+              f"{correct:>4}/{len(samples):<4} {seconds * 1e6:>9.1f}{mark}")
+    if not args.no_save:
+        save_preprocess(chosen, args.config)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
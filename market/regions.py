@@ -0,0 +1,43 @@
+import numpy as np
+
+# Name of the region every item has; the others (quantity, stock, ...) are optional.
+PRICE = "price"
+
+
+def bounding_region(regions):
+    """Smallest capture region that covers every region in the iterable."""
+    regions = list(regions)
+    top = min(r["top"] for r in regions)
+    left = min(r["left"] for r in regions)
+    bottom = max(r["top"] + r["height"] for r in regions)
+    right = max(r["left"] + r["width"] for r in regions)
+    return {"top": top, "left": left, "width": right - left, "height": bottom - top}
+
+
+class RegionSet:
+    """Named screen regions read with one grab of their bounding box.
+
+    The box is captured into a buffer allocated once (or, for backends such
+    as mss that allocate their own, straight into theirs), and each named
+    region is a NumPy view into the captured pixels, so reading price,
+    quantity and stock costs one grab and no per-region copies.
+    """
+
+    def __init__(self, regions):
+        self.regions = regions
+        self.bounds = bounding_region(regions.values())
+        top, left = self.bounds["top"], self.bounds["left"]
+        self.slices = {
+            name: (slice(r["top"] - top, r["top"] - top + r["height"]),
+                   slice(r["left"] - left, r["left"] - left + r["width"]))
+            for name, r in regions.items()
+        }
+        self.buffer = np.empty((self.bounds["height"], self.bounds["width"], 4), np.uint8)
+
+    def grab(self, capture):
+        """Capture the bounding box; returns the pixels, possibly the shared buffer the next grab overwrites."""
+        return capture.grab_into(self.bounds, self.buffer)
+
+    def views(self, pixels):
+        """{name: view} of every region within a capture of the bounding box."""
+        return {name: pixels[rows, cols] for name, (rows, cols) in self.slices.items()}
@@ -0,0 +1,173 @@
+"""Recorded price frames: capture them while the bot runs, replay them offline.
+
+    python -m market --record-frames frames.npz        # save what the bot reads
+    python -m market.replay frames.npz                 # accuracy, digit confusion, throughput
+    python -m market.replay frames.npz --preprocess 1,nearest,fixed --templates digit_templates.npz
+
+An archive is a single np.savez_compressed file holding every grayscale
+frame back to back, with each frame's shape and the price read from it.
+The labels are what the bot decoded at the time; fix any wrong ones before
+using an archive as ground truth. Archives also work anywhere a --frames
+directory does (bench, preprocess calibration).
+"""
+import argparse
+import sys
+import threading
+import time
+
+import cv2
+import numpy as np
+
+# Stop adding frames past this many; a long session would otherwise grow without bound.
+MAX_FRAMES = 20000
+
+
+class FrameRecorder:
+    """Keeps distinct price frames and their decoded prices until save()."""
+
+    def __init__(self, path, max_frames=MAX_FRAMES):
+        self.path = path
+        self.max_frames = max_frames
+        self.frames = []
+        self.labels = []
+        self.items = []
+        self.seen = set()
+        self.lock = threading.Lock()
+
+    def add(self, screenshot, price, item=""):
+        """Remember a BGRA capture of a price region that was read as price."""
+        gray = cv2.cvtColor(screenshot, cv2.COLOR_BGRA2GRAY)
+        key = hash((gray.shape, gray.tobytes()))
+        with self.lock:
+            if key in self.seen or len(self.frames) >= self.max_frames:
+                return
+            self.seen.add(key)
+            self.frames.append(gray)
+            self.labels.append(str(price))
+            self.items.append(item)
+
+    def save(self):
+        """Write every frame so far to the archive; returns how many."""
+        with self.lock:
+            frames, labels, items = list(self.frames), list(self.labels), list(self.items)
+        save_archive(self.path, frames, labels, items)
+        return len(frames)
+
+
+def save_archive(path, frames, labels, items=None):
+    """Grayscale frames (any sizes) and their labels as one compressed archive."""
+    shapes = np.array([frame.shape for frame in frames], np.int32).reshape(-1, 2)
+    pixels = np.concatenate([frame.ravel() for frame in frames]) if frames else np.empty(0, np.uint8)
+    np.savez_compressed(path, pixels=pixels, shapes=shapes, labels=np.array(labels, dtype=str),
+                        items=np.array(items or [""] * len(frames), dtype=str))
+
+
+def load_archive(path):
+    """[(price, grayscale frame)] from an archive written by save_archive."""
+    with np.load(path) as data:
+        pixels, shapes, labels = data["pixels"], data["shapes"], data["labels"]
+    frames = []
+    offset = 0
+    for (height, width), label in zip(shapes, labels):
+        size = int(height) * int(width)
+        frames.append((int(label), pixels[offset:offset + size].reshape(height, width)))
+        offset += size
+    return frames
+
+
+def replay(frames, decoder):
+    """Run every (price, gray frame) through the decoder. Returns a result dict.
+
+    confusion[expected][read] counts digits of frames read with the right
+    number of digits; frames with a digit too many or too few are counted in
+    length_errors instead, since their digits cannot be lined up.
+    """
+    screenshots = [(str(price), cv2.cvtColor(gray, cv2.COLOR_GRAY2BGRA)) for price, gray in frames]
+    confusion = np.zeros((10, 10), np.int64)
+    correct = length_errors = unread = 0
+    misreads = []
+    start = time.perf_counter()
+    for expected, screenshot in screenshots:
+        text, _ = decoder(screenshot)
+        read = (text or "").replace(",", "")
+        if not read:
+            unread += 1
+            continue
+        if read == expected:
+            correct += 1
+        else:
+            misreads.append((expected, read))
+        if len(read) != len(expected):
+            length_errors += 1
+            continue
+        for e, r in zip(expected, read):
+            confusion[int(e), int(r)] += 1
+    elapsed = time.perf_counter() - start
+
+    return {
+        "frames": len(frames),
+        "correct": correct,
+        "accuracy": correct / len(frames) if frames else 0.0,
+        "unread": unread,
+        "length_errors": length_errors,
+        "frames_per_second": len(frames) / elapsed if elapsed else 0.0,
+        "confusion": confusion.tolist(),
+        "misreads": misreads,
+    }
+
+
+def print_result(result, misreads=10):
+    """Print a replay result: summary line, per-digit confusion and a few misreads."""
+    print(f"{result['correct']}/{result['frames']} correct ({result['accuracy']:.1%}), "
+          f"{result['unread']} unread, {result['length_errors']} with a digit missing or extra, "
+          f"{result['frames_per_second']:.0f} frames/s")
+    confusion = np.array(result["confusion"])
+    print("\nDigit confusion (rows: expected, columns: read)")
+    print("     " + "".join(f"{d:>6}" for d in range(10)) + "   recall")
+    for d in range(10):
+        total = confusion[d].sum()
+        recall = f"{confusion[d, d] / total:.3f}" if total else "    -"
+        print(f"{d:>5}" + "".join(f"{n:>6}" for n in confusion[d]) + f"   {recall}")
+    if result["misreads"]:
+        print("\nMisreads (expected -> read):")
+        for expected, read in result["misreads"][:misreads]:
+            print(f"  {expected} -> {read}")
+
+
+def main(argv=None):
+    from market.bench import load_frames, parse_preprocess
+    from market.digits import TEMPLATE_FILE, DigitRecognizer, PriceDecoder
+    from market.frame_cache import FrameCache
+    from market.preprocess import DEFAULT, Preprocessor
+
+    parser = argparse.ArgumentParser(description="Replay recorded price frames through the recognizer.")
+    parser.add_argument("frames", help="archive from --record-frames, or a directory of <price>[_n].png")
+    parser.add_argument("--templates", default=TEMPLATE_FILE)
+    parser.add_argument("--preprocess", type=parse_preprocess, default=DEFAULT, metavar="SCALE,INTERP,METHOD")
+    parser.add_argument("--easyocr", action="store_true", help="enable the EasyOCR fallback")
+    parser.add_argument("--json", help="write the result to this file")
+    args = parser.parse_args(argv)
+
+    frames = load_frames(args.frames)
+    reader = None
+    if args.easyocr:
+        from market.ocr import LazyReader
+        reader = LazyReader()
+    # Without learning, replays of the same archive stay comparable.
+    recognizer = DigitRecognizer(args.templates)
+    recognizer.path = None
+    # No frame cache: every frame is recognized, so throughput means something.
+    decoder = PriceDecoder(recognizer, reader, frame_cache=FrameCache(max_entries=0),
+                           preprocessor=Preprocessor(args.preprocess))
+    result = replay(frames, decoder)
+    print_result(result)
+    if args.json:
+        import json
+        with open(args.json, "w") as f:
+            json.dump(dict(result, source=args.frames, preprocess=args.preprocess._asdict()), f, indent=4)
+        print(f"\n✅ Results written to {args.json}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
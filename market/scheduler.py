@@ -0,0 +1,66 @@
+import heapq
+
+# A price at or below threshold * HOT_MARGIN keeps its item hot.
+HOT_MARGIN = 1.1
+
+
+class WatchItem:
+    """One listing to watch: where to click, where its price shows, what to pay.
+
+    fields optionally maps more names (quantity, stock) to regions read
+    alongside the price. With an AdaptiveThreshold set as adaptive, the bot
+    replaces threshold with the adaptive one before every decision.
+    """
+
+    def __init__(self, name, coords, region, threshold, priority=1.0, fields=None):
+        self.name = name
+        self.coords = coords
+        self.region = region
+        self.fields = fields or {}
+        self.threshold = threshold
+        self.priority = priority
+        self.adaptive = None
+        self.interval = 1.0
+        self.last_price = None
+        self.checks = 0
+
+    def __repr__(self):
+        return f"WatchItem({self.name!r}, threshold={self.threshold}, priority={self.priority})"
+
+
+class Scheduler:
+    """Round-robin over the watchlist, weighted by priority and backoff.
+
+    Time here is counted in checks, not seconds: the mouse can only look at one
+    listing at a time, so there is never a reason to idle. Each check pushes an
+    item back by interval / priority. An item whose price just changed, or is
+    close to its threshold, is hot and keeps the minimum interval. Each check
+    with an unchanged price doubles the interval, up to max_backoff.
+    """
+
+    def __init__(self, items, max_backoff=16.0, backoff=2.0):
+        self.max_backoff = max_backoff
+        self.backoff = backoff
+        self.heap = [(0.0, i, item) for i, item in enumerate(items)]
+        heapq.heapify(self.heap)
+        self.seq = len(items)
+        self.now = 0.0
+
+    def next(self):
+        """Take the item due soonest; hand it back with done()."""
+        self.now, _, item = heapq.heappop(self.heap)
+        return item
+
+    def done(self, item, price):
+        """Reschedule an item after a check that read price (None if unread)."""
+        item.checks += 1
+        changed = price is not None and price != item.last_price
+        hot = price is not None and price <= item.threshold * HOT_MARGIN
+        if changed or hot:
+            item.interval = 1.0
+        else:
+            item.interval = min(item.interval * self.backoff, self.max_backoff)
+        if price is not None:
+            item.last_price = price
+        heapq.heappush(self.heap, (self.now + item.interval / item.priority, self.seq, item))
+        self.seq += 1
@@ -0,0 +1,218 @@
+"""Headless market simulator: renders a scripted price feed and records clicks.
+
+    python -m market.simulator --mode v5 --cycles 200
+"""
+import argparse
+import logging
+import random
+import threading
+import time
+
+import cv2
+import numpy as np
+
+from market.backends import Capture, Input
+from market.bot import Bot
+from market.digits import DigitRecognizer, PriceDecoder
+from market.modes import MODES
+from market.preprocess import DEFAULT, Preprocessor
+from market.replay import FrameRecorder
+from market.scheduler import WatchItem
+from market.timing import NO_TIMING
+
+COORDS = {
+    "follow": (100, 100),
+    "item": (100, 200),
+    "return": (100, 300),
+    "max": (400, 200),
+    "purchase": (400, 300),
+    "confirm": (400, 400),
+}
+REGION = {"top": 500, "left": 300, "width": 160, "height": 30}
+
+# Background level of each view, so every click visibly changes the screen.
+VIEW_FILL = {"list": 40, "item": 20, "max": 25, "confirm": 60}
+CLICK_RADIUS = 10
+
+
+def render_price(price, width, height):
+    """White price text on a dark background, formatted like the game."""
+    image = np.zeros((height, width), np.uint8)
+    scale = height / 40.0
+    cv2.putText(image, f"{price:,}", (4, int(height * 0.8)), cv2.FONT_HERSHEY_SIMPLEX, scale, 255, 2)
+    return image
+
+
+class SimulatedMarket(Capture, Input):
+    """Fake game screen driven by a price feed; clicking the item shows the next price.
+
+    Feed entries are prices, or (price, image) pairs to show a recorded
+    grayscale capture of the price region instead of rendered text.
+    """
+
+    def __init__(self, prices, coords=COORDS, region=REGION, render_delay=0.01, on_exhausted=None):
+        self.prices = iter(prices)
+        self.coords = coords
+        self.region = region
+        self.render_delay = render_delay
+        self.on_exhausted = on_exhausted
+        self.lock = threading.Lock()
+        self.clicks = []
+        self.shown = []
+        self.buys = []
+        self.price = None
+        self.image = None
+        self.generation = 0
+        self.view = self.old_view = ("list", 0, None)
+        self.visible_at = 0.0
+        self.last_click = (0, 0)
+
+    def position(self):
+        return self.last_click
+
+    def click(self, x, y):
+        with self.lock:
+            self.last_click = (x, y)
+            name = self._button_at(x, y)
+            self.clicks.append((time.perf_counter(), name))
+            kind = self.view[0]
+            if name == "item":
+                entry = next(self.prices, None)
+                self.price, self.image = entry if isinstance(entry, tuple) else (entry, None)
+                if self.price is None and self.on_exhausted:
+                    self.on_exhausted()
+                self.shown.append(self.price)
+                kind = "item"
+            elif name == "follow":
+                self.generation += 1
+                kind = "list"
+            elif name == "return":
+                kind = "list"
+            elif name == "max":
+                kind = "max"
+            elif name == "purchase":
+                if self.price is not None:
+                    self.buys.append(self.price)
+                kind = "confirm"
+            elif name == "confirm":
+                kind = "list"
+            self._show((kind, self.generation, self.price))
+
+    def grab(self, region):
+        return self.grab_into(region, np.empty((region["height"], region["width"], 4), np.uint8))
+
+    def grab_into(self, region, out):
+        with self.lock:
+            view = self.view if time.perf_counter() >= self.visible_at else self.old_view
+        kind, generation, price = view
+
+        fill = VIEW_FILL[kind] + 7 * (generation % 8) if kind == "list" else VIEW_FILL[kind]
+        out[:, :, :3] = fill
+        out[:, :, 3] = 255
+        if kind in ("item", "max") and price is not None:
+            self._paste_price(out, region, price)
+        return out
+
+    def _show(self, view):
+        """Switch to a new view after the simulated render delay."""
+        if time.perf_counter() >= self.visible_at:
+            self.old_view = self.view
+        self.view = view
+        self.visible_at = time.perf_counter() + self.render_delay
+
+    def _button_at(self, x, y):
+        for name, (bx, by) in self.coords.items():
+            if abs(bx - x) <= CLICK_RADIUS and abs(by - y) <= CLICK_RADIUS:
+                return name
+        return None
+
+    def _paste_price(self, frame, region, price):
+        r = self.region
+        top = max(region["top"], r["top"])
+        left = max(region["left"], r["left"])
+        bottom = min(region["top"] + region["height"], r["top"] + r["height"])
+        right = min(region["left"] + region["width"], r["left"] + r["width"])
+        if top >= bottom or left >= right:
+            return
+        if self.image is not None:
+            text = self.image
+        else:
+            text = render_price(price, r["width"], r["height"])
+        patch = text[top - r["top"]:bottom - r["top"], left - r["left"]:right - r["left"]]
+        dst = frame[top - region["top"]:bottom - region["top"], left - region["left"]:right - region["left"]]
+        mask = patch > 0
+        dst[mask, :3] = patch[mask, None]
+
+
+def calibrate(recognizer, decoder, region=REGION):
+    """Teach the recognizer the simulator font, since there is no EasyOCR to learn from."""
+    for shift in range(1, 10):
+        price = int("".join(str((shift + i) % 10) for i in range(7)))
+        text = render_price(price, region["width"], region["height"])
+        frame = cv2.cvtColor(text, cv2.COLOR_GRAY2BGRA)
+        binary = decoder.preprocess(cv2.cvtColor(frame, cv2.COLOR_BGRA2GRAY))
+        recognizer.learn(binary, str(price))
+
+
+def make_feed(count, threshold, cheap_ratio=0.1, seed=None):
+    """Random prices around the threshold, roughly cheap_ratio of them buyable."""
+    rng = random.Random(seed)
+    prices = []
+    for _ in range(count):
+        if rng.random() < cheap_ratio:
+            prices.append(rng.randint(threshold // 2, threshold))
+        else:
+            prices.append(rng.randint(threshold + 1, threshold * 3))
+    return prices
+
+
+def run(mode, prices, threshold, render_delay=0.01, scan_interval=0.2, region=REGION, recognizer=None,
+        reader=None, timings=NO_TIMING, preprocess=DEFAULT, recorder=None):
+    """Drive one mode over the feed headlessly. Returns (market, bot, elapsed seconds).
+
+    Without a recognizer, a fresh one is calibrated on the simulator font.
+    """
+    market = SimulatedMarket(prices, region=region, render_delay=render_delay)
+    decoder = PriceDecoder(recognizer or DigitRecognizer(path=None), reader,
+                           preprocessor=Preprocessor(preprocess, timings), timings=timings)
+    if recognizer is None:
+        calibrate(decoder.recognizer, decoder, region)
+
+    items = [WatchItem("item", COORDS["item"], region, threshold)]
+    bot = Bot(market, market, COORDS, items, decoder, scan_interval, recorder=recorder, timings=timings)
+    market.on_exhausted = bot.control.stop
+    start = time.perf_counter()
+    bot.run(MODES[mode])
+    return market, bot, time.perf_counter() - start
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run a bot mode against the simulated market.")
+    parser.add_argument("--mode", choices=sorted(MODES), default="v5")
+    parser.add_argument("--cycles", type=int, default=100)
+    parser.add_argument("--threshold", type=int, default=19000)
+    parser.add_argument("--render-delay", type=float, default=0.01)
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--log-level", type=str.upper, choices=("DEBUG", "INFO", "WARNING", "ERROR"), default="INFO",
+                        help="DEBUG shows every click")
+    parser.add_argument("--record-frames", metavar="FILE.npz", help="save the price frames read, for market.replay")
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=args.log_level, format="%(message)s")
+
+    prices = make_feed(args.cycles, args.threshold, seed=args.seed)
+    recorder = FrameRecorder(args.record_frames) if args.record_frames else None
+    market, bot, elapsed = run(args.mode, prices, args.threshold, args.render_delay, recorder=recorder)
+
+    expected = [p for p in market.shown if p is not None and p <= args.threshold]
+    print(f"\n{args.mode}: {bot.cycles} cycles in {elapsed:.2f}s ({bot.cycles / elapsed:.1f} cycles/s)")
+    print(f"Bought {len(market.buys)} of {len(expected)} cheap listings")
+    if market.buys != expected:
+        print(f"❌ Decisions differ: expected {expected}, bought {market.buys}")
+    else:
+        print("✅ Every cheap listing bought, nothing else")
+    if recorder:
+        print(f"Saved {recorder.save()} price frames to {args.record_frames}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,149 @@
+import csv
+import json
+import logging
+import threading
+import time
+
+import numpy as np
+
+STAGES = ("capture", "cvtColor", "resize", "threshold", "ocr", "decision", "confirm", "click", "verify", "cycle", "idle")
+
+# Stages shown in the periodic one-line summary, besides the cycle itself.
+SUMMARY_STAGES = ("capture", "ocr", "decision", "click")
+
+log = logging.getLogger("market")
+
+
+class StageTimes:
+    """Per-stage duration samples in fixed-size ring buffers (newest SIZE samples kept).
+
+    Every sample also goes into a fixed-size trace ring of (time, stage,
+    duration) rows that dump_trace() writes out as CSV or JSONL.
+    """
+
+    def __init__(self, size=4096, trace_size=65536, stages=STAGES):
+        self.size = size
+        self.stages = stages
+        self.index = {stage: i for i, stage in enumerate(stages)}
+        self.samples = {stage: np.zeros(size) for stage in stages}
+        self.counts = dict.fromkeys(stages, 0)
+        self.trace_size = trace_size
+        self.trace_at = np.zeros(trace_size)
+        self.trace_stage = np.zeros(trace_size, np.uint8)
+        self.trace_seconds = np.zeros(trace_size)
+        self.traced = 0
+        # perf_counter() has no epoch; this converts trace times to wall-clock.
+        self.epoch = time.time() - time.perf_counter()
+        self.lock = threading.Lock()
+
+    def record(self, stage, seconds):
+        """Store one duration for a stage."""
+        now = time.perf_counter()
+        with self.lock:
+            i = self.counts[stage]
+            self.samples[stage][i % self.size] = seconds
+            self.counts[stage] = i + 1
+            j = self.traced % self.trace_size
+            self.trace_at[j] = now
+            self.trace_stage[j] = self.index[stage]
+            self.trace_seconds[j] = seconds
+            self.traced += 1
+
+    def since(self, stage, start):
+        """Record the time elapsed since a perf_counter() start."""
+        self.record(stage, time.perf_counter() - start)
+
+    def values(self, stage):
+        """The retained samples for a stage, in seconds."""
+        with self.lock:
+            return self.samples[stage][:min(self.counts[stage], self.size)].copy()
+
+    def percentiles(self, stage):
+        """p50/p95/p99 in milliseconds, or None if the stage never ran."""
+        values = self.values(stage)
+        if len(values) == 0:
+            return None
+        p50, p95, p99 = (float(v) for v in np.percentile(values, (50, 95, 99)) * 1000.0)
+        return {"count": self.counts[stage], "p50_ms": p50, "p95_ms": p95, "p99_ms": p99}
+
+    def report(self):
+        """Percentiles for every stage that ran."""
+        return {stage: p for stage in self.samples if (p := self.percentiles(stage))}
+
+    def summary(self):
+        """One-line p50/p95 digest of the cycle and the main stages."""
+        parts = []
+        for stage in ("cycle",) + SUMMARY_STAGES:
+            p = self.percentiles(stage)
+            if p:
+                parts.append(f"{stage} {p['p50_ms']:.1f}/{p['p95_ms']:.1f}ms")
+        return " | ".join(parts)
+
+    def dump_trace(self, path):
+        """Write the retained trace as CSV, or JSONL if path ends in .jsonl."""
+        with self.lock:
+            count = min(self.traced, self.trace_size)
+            order = np.arange(self.traced - count, self.traced) % self.trace_size
+            at = self.trace_at[order] + self.epoch
+            stages = self.trace_stage[order]
+            seconds = self.trace_seconds[order]
+
+        with open(path, "w", newline="") as f:
+            if path.endswith(".jsonl"):
+                for t, s, d in zip(at, stages, seconds):
+                    f.write(json.dumps({"time": t, "stage": self.stages[s], "ms": d * 1000.0}) + "\n")
+            else:
+                writer = csv.writer(f)
+                writer.writerow(["time", "stage", "ms"])
+                for t, s, d in zip(at, stages, seconds):
+                    writer.writerow([f"{t:.6f}", self.stages[s], f"{d * 1000.0:.4f}"])
+        return count
+
+
+class StatsReporter:
+    """Logs a one-line stats summary every interval seconds on a daemon thread."""
+
+    def __init__(self, timings, interval=10.0, extra=None):
+        self.timings = timings
+        self.interval = interval
+        self.extra = extra
+        self.stopped = threading.Event()
+        self._last_cycles = 0
+        self.thread = threading.Thread(target=self._run, name="stats", daemon=True)
+
+    def start(self):
+        """Begin periodic reporting."""
+        self.thread.start()
+
+    def stop(self):
+        """Stop reporting and log a final line."""
+        self.stopped.set()
+        self.report()
+
+    def report(self, elapsed=None):
+        """Log the current summary, with the cycle rate over elapsed seconds if given."""
+        line = self.timings.summary()
+        if elapsed:
+            cycles = self.timings.counts.get("cycle", 0) - self._last_cycles
+            line = f"{cycles / elapsed:.1f} cycles/s | {line}"
+        if self.extra:
+            line = f"{line} | {self.extra()}"
+        log.info(f"📊 {line}")
+
+    def _run(self):
+        while not self.stopped.wait(self.interval):
+            self.report(self.interval)
+            self._last_cycles = self.timings.counts.get("cycle", 0)
+
+
+class NoTiming:
+    """Stand-in used when nothing is measuring; every call is a no-op."""
+
+    def record(self, stage, seconds):
+        pass
+
+    def since(self, stage, start):
+        pass
+
+
+NO_TIMING = NoTiming()
@@ -0,0 +1,49 @@
+import time
+
+POLL_INTERVAL = 0.005
+SETTLE_FRAMES = 2
+PATCH_SIZE = 24
+
+
+def around(x, y, size=PATCH_SIZE):
+    """Small capture region centred on a screen coordinate."""
+    return {"top": y - size // 2, "left": x - size // 2, "width": size, "height": size}
+
+
+def snapshot(capture, region):
+    """Raw pixels of a region, cheap to compare."""
+    return capture.grab(region).tobytes()
+
+
+def wait_for_region_change(capture, region, timeout, baseline=None, interrupt=None):
+    """Poll a region until it differs from baseline and then holds still.
+
+    Take the baseline before the click that should change the region.
+    Returns True once the region has settled, False if nothing changed in time.
+    Setting the interrupt Event, if given, ends the wait like a timeout.
+    """
+    deadline = time.perf_counter() + timeout
+    if baseline is None:
+        baseline = snapshot(capture, region)
+
+    previous = None
+    stable = 0
+    while time.perf_counter() < deadline:
+        if interrupt is None:
+            time.sleep(POLL_INTERVAL)
+        elif interrupt.wait(POLL_INTERVAL):
+            break
+        frame = snapshot(capture, region)
+        if previous is None:
+            if frame != baseline:
+                previous = frame
+            continue
+        if frame == previous:
+            stable += 1
+            if stable >= SETTLE_FRAMES:
+                return True
+        else:
+            previous = frame
+            stable = 0
+    # Changed but still animating: the newest frame is as good as it gets.
+    return previous is not None